@@ -4,21 +4,44 @@ This package intentionally keeps the original misspellings ("ArtifitialInteligen
 so imports and type names stay familiar when comparing to the C# codebase.
 """
 
-from .enums import BoardIndex, GameState, MoveType, Player
+from .enums import BoardIndex, BoundType, EndgameResult, GameState, MoveType, ParallelMode, Player, ResearchPolicy, StopReason
 from .eval_settings import EvalSettings
 from .move import Move
 from .board import Board
+from .bit_board import BitBoard
 from .game_node import GameNode
+from .models.endgame_entry import EndgameEntry
+from .models.iteration_stats import IterationStats
+from .models.search_stats import SearchStats
+from .models.worker_stats import WorkerStats
+from .transposition_table import TranspositionTable
+from .shared_transposition_table import SharedTranspositionTable
+from .endgame_db import EndgameDatabase
+from .opening_book import OpeningBook
 from .game_controller import GameController
 
 __all__ = [
     "BoardIndex",
+    "BoundType",
+    "EndgameResult",
     "GameState",
     "MoveType",
+    "ParallelMode",
     "Player",
+    "ResearchPolicy",
+    "StopReason",
     "EvalSettings",
     "Move",
     "Board",
+    "BitBoard",
     "GameNode",
+    "EndgameEntry",
+    "IterationStats",
+    "SearchStats",
+    "WorkerStats",
+    "TranspositionTable",
+    "SharedTranspositionTable",
+    "EndgameDatabase",
+    "OpeningBook",
     "GameController",
 ]
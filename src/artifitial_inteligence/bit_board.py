@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .board import Board
+from .board_tables import ADJACENT_MASKS, DEGREE, FULL_MASK, MILL_MASKS, MILL_PARTNER_MASKS, NEIGHBORS
+from .enums import BoardIndex, GameState, MoveType, Player
+from .eval_settings import EvalSettings
+from .move import CAPTURE_BIT, NO_MOVE, Move, decode_move, encode_move
+from .zobrist import PIECE_KEYS, TURN_KEYS, UNPLACED_KEYS, position_key
+
+# Undo information returned by `BitBoard.make_move()`: a snapshot of every field
+# a move can touch (white mask, black mask, unplaced, placed, side to move, key).
+BitUndoToken = tuple[int, int, int, int, int, int, Player, int]
+
+# Parts of the move codes (`encode_move()`) the generator puts together.
+_MOVE = int(MoveType.Move)
+_DROP_AND_CAPTURE = int(MoveType.DropAndCapture)
+_MOVE_AND_CAPTURE = int(MoveType.MoveAndCapture)
+_NO_START = 31 << 2
+_NO_CAPTURE = 31 << 12
+
+
+class BitBoard:
+    """Bitboard-backed alternative to `Board`.
+
+    The position is two 24-bit masks (white, black) plus the unplaced/placed
+    counters, so copying is a handful of integer assignments and mill tests are
+    mask comparisons against `board_tables`. Move generation order, evaluation
+    scores and win detection match `Board` exactly.
+    """
+
+    MAX_MOVES = Board.MAX_MOVES
+
+    OurBoardsGenerated: int = 0
+    OurBoardsDeleted: int = 0
+
+    def __init__(self, arg: Player | Board | "BitBoard"):
+        BitBoard.OurBoardsGenerated += 1
+
+        if isinstance(arg, BitBoard):
+            self.my_player_turn: Player = arg.my_player_turn
+            self.my_masks: list[int] = [arg.my_masks[0], arg.my_masks[1]]
+            self.my_unplaced: list[int] = [arg.my_unplaced[0], arg.my_unplaced[1]]
+            self.my_placed: list[int] = [arg.my_placed[0], arg.my_placed[1]]
+            self.my_hash: int = arg.my_hash
+            return
+
+        if isinstance(arg, Board):
+            self.my_player_turn = arg.my_player_turn
+            self.my_masks = [0, 0]
+            for i in range(24):
+                p = arg.my_positions[i].player
+                if p != Player.Neutral:
+                    self.my_masks[int(p)] |= 1 << i
+            self.my_unplaced = [arg.my_unplaced[0], arg.my_unplaced[1]]
+            self.my_placed = [arg.my_placed[0], arg.my_placed[1]]
+            self.my_hash = self.compute_hash()
+            return
+
+        self.my_player_turn = Player(arg)
+        self.my_masks = [0, 0]
+        self.my_unplaced = [9, 9]
+        self.my_placed = [0, 0]
+        self.my_hash = self.compute_hash()
+
+    def dispose(self) -> None:
+        BitBoard.OurBoardsDeleted += 1
+
+    def _mask_of(self, player: Player) -> int:
+        if player == Player.Neutral:
+            return FULL_MASK & ~(self.my_masks[0] | self.my_masks[1])
+        return self.my_masks[int(player)]
+
+    def get_hash(self) -> int:
+        """64-bit Zobrist key of the position; equal to `Board.get_hash()` for the same position."""
+        return self.my_hash
+
+    def compute_hash(self) -> int:
+        return position_key(self.my_masks[0], self.my_masks[1], self.my_unplaced, self.my_player_turn)
+
+    def player_at(self, index: BoardIndex) -> Player:
+        bit = 1 << int(index)
+        if self.my_masks[0] & bit:
+            return Player.White
+        if self.my_masks[1] & bit:
+            return Player.Black
+        return Player.Neutral
+
+    @staticmethod
+    def _forms_mill(index: int, mask: int) -> bool:
+        h, v = MILL_PARTNER_MASKS[index]
+        return (h & mask) == h or (v & mask) == v
+
+    def _add_capture_codes(self, moves: list[int], count: int, limit: int, base: int) -> int:
+        """Write `base` with every capturable opponent point into `moves[count:limit]`; return the new count."""
+        opponent_mask = self.my_masks[1 - self.my_player_turn]
+        first = count
+
+        m = opponent_mask
+        while m and count < limit:
+            low = m & -m
+            j = low.bit_length() - 1
+            m ^= low
+            if not self._forms_mill(j, opponent_mask):
+                moves[count] = base | j << 12
+                count += 1
+
+        # Exception rule: if all opponent pieces are in mills, allow capturing any.
+        if count == first:
+            m = opponent_mask
+            while m and count < limit:
+                low = m & -m
+                j = low.bit_length() - 1
+                m ^= low
+                moves[count] = base | j << 12
+                count += 1
+
+        return count
+
+    def get_moves(self) -> list[Optional[Move]]:
+        codes = [NO_MOVE] * BitBoard.MAX_MOVES
+        count = self.generate_moves(codes)
+        moves: list[Optional[Move]] = [decode_move(code) for code in codes[:count]]
+        return moves + [None] * (BitBoard.MAX_MOVES - count)
+
+    def generate_moves(self, moves: list[int]) -> int:
+        """Write the codes (`encode_move()`) of the moves `get_moves()` returns into `moves`; return how many.
+
+        Same contract and order as `Board.generate_moves()`.
+        """
+        captures, quiets = self._generate(moves, True)
+        if quiets:
+            limit = BitBoard.MAX_MOVES
+            moves[captures : captures + quiets] = moves[limit - quiets : limit][::-1]
+        return captures + quiets
+
+    def generate_captures(self, moves: list[int]) -> tuple[int, int]:
+        """Same as `Board.generate_captures()`."""
+        captures, quiets = self._generate(moves, False)
+        return captures, captures + quiets
+
+    def _generate(self, moves: list[int], write_quiets: bool) -> tuple[int, int]:
+        """Same as `Board._generate()`."""
+        limit = BitBoard.MAX_MOVES
+        captures = 0
+        quiets = 0
+
+        turn = self.my_player_turn
+        own_mask = self.my_masks[turn]
+        empty_mask = FULL_MASK & ~(self.my_masks[0] | self.my_masks[1])
+
+        # Stage 1: enumerate all drops.
+        if self.my_unplaced[turn] > 0:
+            m = empty_mask
+            while m:
+                low = m & -m
+                idx = low.bit_length() - 1
+                m ^= low
+                if self._forms_mill(idx, own_mask):
+                    captures = self._add_capture_codes(
+                        moves, captures, limit - quiets, _DROP_AND_CAPTURE | _NO_START | idx << 7
+                    )
+                elif captures + quiets < limit:
+                    quiets += 1
+                    if write_quiets:
+                        moves[limit - quiets] = _NO_START | idx << 7 | _NO_CAPTURE
+
+        # Stage 2: adjacent moves; stage 3: flying to any empty point.
+        else:
+            flying = self.my_placed[turn] <= 3
+            empty_points = [j for j in range(24) if empty_mask >> j & 1] if flying else None
+            m = own_mask
+            while m:
+                low = m & -m
+                idx = low.bit_length() - 1
+                m ^= low
+                rest = own_mask ^ low
+                for n in empty_points if flying else NEIGHBORS[idx]:
+                    if not empty_mask >> n & 1:
+                        continue
+                    if self._forms_mill(n, rest):
+                        captures = self._add_capture_codes(
+                            moves, captures, limit - quiets, _MOVE_AND_CAPTURE | idx << 2 | n << 7
+                        )
+                    elif captures + quiets < limit:
+                        quiets += 1
+                        if write_quiets:
+                            moves[limit - quiets] = _MOVE | idx << 2 | n << 7 | _NO_CAPTURE
+
+        return captures, quiets
+
+    def generate_quiets(self, moves: list[int], count: int, limit: int) -> int:
+        """Same as `Board.generate_quiets()`."""
+        turn = self.my_player_turn
+        own_mask = self.my_masks[turn]
+        empty_mask = FULL_MASK & ~(self.my_masks[0] | self.my_masks[1])
+
+        if self.my_unplaced[turn] > 0:
+            m = empty_mask
+            while m and count < limit:
+                low = m & -m
+                idx = low.bit_length() - 1
+                m ^= low
+                if not self._forms_mill(idx, own_mask):
+                    moves[count] = _NO_START | idx << 7 | _NO_CAPTURE
+                    count += 1
+            return count
+
+        flying = self.my_placed[turn] <= 3
+        empty_points = [j for j in range(24) if empty_mask >> j & 1] if flying else None
+        m = own_mask
+        while m:
+            low = m & -m
+            idx = low.bit_length() - 1
+            m ^= low
+            rest = own_mask ^ low
+            for n in empty_points if flying else NEIGHBORS[idx]:
+                if count >= limit:
+                    return count
+                if empty_mask >> n & 1 and not self._forms_mill(n, rest):
+                    moves[count] = _MOVE | idx << 2 | n << 7 | _NO_CAPTURE
+                    count += 1
+        return count
+
+    def is_legal_code(self, code: int) -> bool:
+        """Same as `Board.is_legal_code()`."""
+        turn = self.my_player_turn
+        own_mask = self.my_masks[turn]
+        opponent_mask = self.my_masks[1 - turn]
+        start = code >> 2 & 31
+        end = code >> 7 & 31
+        capture = code >> 12
+        if end >= 24 or (own_mask | opponent_mask) >> end & 1:
+            return False
+        if self.my_unplaced[turn] > 0:
+            if code & 1 or start != 31:
+                return False
+        elif not code & 1 or start >= 24 or not own_mask >> start & 1:
+            return False
+        else:
+            if self.my_placed[turn] > 3 and not ADJACENT_MASKS[start] >> end & 1:
+                return False
+            own_mask ^= 1 << start
+
+        if not self._forms_mill(end, own_mask):
+            return not code & CAPTURE_BIT and capture == 31
+        if not code & CAPTURE_BIT or capture >= 24 or not opponent_mask >> capture & 1:
+            return False
+        if not self._forms_mill(capture, opponent_mask):
+            return True
+        # A piece in a mill can only be taken when every opponent piece is in one.
+        m = opponent_mask
+        while m:
+            low = m & -m
+            if not self._forms_mill(low.bit_length() - 1, opponent_mask):
+                return False
+            m ^= low
+        return True
+
+    def move(self, move: Move) -> None:
+        self.move_code(encode_move(move))
+
+    def move_code(self, code: int) -> None:
+        """`move()` for a move code (`encode_move()`)."""
+        end = code >> 7 & 31
+        # Type bit 0 is set for Move and MoveAndCapture, clear for the drops.
+        if code & 1:
+            self._move_positions(code >> 2 & 31, end)
+        else:
+            self._drop(end)
+        if code & CAPTURE_BIT:
+            self._capture(code >> 12)
+
+        self._change_turn()
+
+    def make_move(self, move: Move) -> BitUndoToken:
+        """Play `move` in place and return the token `unmake_move()` needs to take it back."""
+        return self.make_move_code(encode_move(move))
+
+    def make_move_code(self, code: int) -> BitUndoToken:
+        """`make_move()` for a move code (`encode_move()`)."""
+        token = (
+            self.my_masks[0],
+            self.my_masks[1],
+            self.my_unplaced[0],
+            self.my_unplaced[1],
+            self.my_placed[0],
+            self.my_placed[1],
+            self.my_player_turn,
+            self.my_hash,
+        )
+        self.move_code(code)
+        return token
+
+    def unmake_move(self, token: BitUndoToken) -> None:
+        """Restore the position from before the `make_move()` call that produced `token`."""
+        (
+            self.my_masks[0],
+            self.my_masks[1],
+            self.my_unplaced[0],
+            self.my_unplaced[1],
+            self.my_placed[0],
+            self.my_placed[1],
+            self.my_player_turn,
+            self.my_hash,
+        ) = token
+
+    def _clear(self, index: int) -> None:
+        bit = 1 << index
+        for player in (0, 1):
+            if self.my_masks[player] & bit:
+                self.my_masks[player] &= ~bit
+                self.my_hash ^= PIECE_KEYS[player][index]
+
+    def _drop(self, pos: int) -> None:
+        turn = self.my_player_turn
+        self._clear(pos)
+        self.my_masks[turn] |= 1 << pos
+        self.my_hash ^= PIECE_KEYS[turn][pos] ^ UNPLACED_KEYS[turn][self.my_unplaced[turn]]
+        self.my_unplaced[turn] -= 1
+        self.my_placed[turn] += 1
+        self.my_hash ^= UNPLACED_KEYS[turn][self.my_unplaced[turn]]
+
+    def _capture(self, pos: int) -> None:
+        bit = 1 << pos
+        for player in (0, 1):
+            if self.my_masks[player] & bit:
+                self.my_placed[player] -= 1
+        self._clear(pos)
+
+    def _move_positions(self, start: int, end: int) -> None:
+        self._clear(start)
+        self._clear(end)
+        if self.my_player_turn != Player.Neutral:
+            turn = self.my_player_turn
+            self.my_masks[turn] |= 1 << end
+            self.my_hash ^= PIECE_KEYS[turn][end]
+
+    def _change_turn(self) -> None:
+        previous = self.my_player_turn
+        self.my_player_turn = Player.Black if self.my_player_turn == Player.White else Player.White
+        self.my_hash ^= TURN_KEYS[int(previous)] ^ TURN_KEYS[int(self.my_player_turn)]
+
+    def get_stage(self) -> GameState:
+        if self.my_unplaced[int(Player.White)] > 0 or self.my_unplaced[int(Player.Black)] > 0:
+            return GameState.One
+        if self.my_placed[int(Player.White)] < 4 or self.my_placed[int(Player.Black)] < 4:
+            return GameState.Three
+        return GameState.Two
+
+    def has_won(self, player: Player) -> bool:
+        opponent = Player.Black if player == Player.White else Player.White
+        figure_count = 3
+
+        # If opponent has unplaced pieces, game is still in stage one.
+        if self.my_unplaced[int(opponent)] > 0:
+            return False
+
+        if (self.my_placed[int(opponent)] + self.my_unplaced[int(opponent)]) < figure_count:
+            return True
+
+        return self._blocked(opponent)
+
+    def _blocked(self, player: Player) -> bool:
+        empty_mask = FULL_MASK & ~(self.my_masks[0] | self.my_masks[1])
+        m = self._mask_of(player)
+        while m:
+            low = m & -m
+            if ADJACENT_MASKS[low.bit_length() - 1] & empty_mask:
+                return False
+            m ^= low
+        return True
+
+    def is_same_board_state(self, other: Board | "BitBoard") -> bool:
+        # O(1) reject on the key with the side to move factored out (it is not compared).
+        if (self.my_hash ^ TURN_KEYS[int(self.my_player_turn)]) != (
+            other.get_hash() ^ TURN_KEYS[int(other.my_player_turn)]
+        ):
+            return False
+        if not isinstance(other, BitBoard):
+            other = BitBoard(other)
+        return (
+            self.my_placed == other.my_placed
+            and self.my_unplaced == other.my_unplaced
+            and self.my_masks == other.my_masks
+        )
+
+    def _count_mills(self, start_player: Player, player: Player) -> int:
+        # Same semantics as `Board._count_mills()`: count lines that hold a
+        # `start_player` point whose two line partners both belong to `player`.
+        player_mask = self._mask_of(player)
+        ret = 0
+        if start_player == player:
+            for line in MILL_MASKS:
+                if (line & player_mask) == line:
+                    ret += 1
+            return ret
+
+        start_mask = self._mask_of(start_player)
+        for line in MILL_MASKS:
+            if (line & start_mask) and (line & player_mask).bit_count() == 2:
+                ret += 1
+        return ret
+
+    def evaluate(self, evals: EvalSettings) -> int:
+        stage = self.get_stage()
+        if stage == GameState.One:
+            return self._eval_one(evals)
+        if stage == GameState.Two:
+            return self._eval_two(evals)
+        return self._eval_three(evals)
+
+    def _eval_one(self, evals: EvalSettings) -> int:
+        opponent = Player.Black if self.my_player_turn == Player.White else Player.White
+        ret = 0
+
+        ret += evals.MillBlocked * self._count_mills(self.my_player_turn, opponent)
+
+        m = self._mask_of(self.my_player_turn)
+        while m:
+            low = m & -m
+            ret += evals.AdjacentSpot * DEGREE[low.bit_length() - 1]
+            m ^= low
+
+        ret += evals.CapturedPiece * max(0, 9 - (self.my_placed[int(opponent)] + self.my_unplaced[int(opponent)]))
+        ret += evals.LostPiece * max(
+            0, 9 - (self.my_placed[int(self.my_player_turn)] + self.my_unplaced[int(self.my_player_turn)])
+        )
+
+        ret += evals.MillOpponent * self._count_mills(opponent, opponent)
+        return ret
+
+    def _eval_two(self, evals: EvalSettings) -> int:
+        opponent = Player.Black if self.my_player_turn == Player.White else Player.White
+        ret = 0
+
+        if self.has_won(opponent):
+            return evals.WorstScore
+
+        if self.has_won(self.my_player_turn):
+            return evals.BestScore
+
+        ret += evals.CapturedPiece * max(0, 9 - (self.my_placed[int(opponent)] + self.my_unplaced[int(opponent)]))
+        ret += evals.LostPiece * max(
+            0, 9 - (self.my_placed[int(self.my_player_turn)] + self.my_unplaced[int(self.my_player_turn)])
+        )
+
+        ret += evals.MillFormable * self._count_mills(Player.Neutral, self.my_player_turn)
+        ret += evals.MillFormed * self._count_mills(self.my_player_turn, self.my_player_turn)
+        ret += evals.MillOpponent * self._count_mills(opponent, opponent)
+
+        empty_mask = FULL_MASK & ~(self.my_masks[0] | self.my_masks[1])
+        m = self._mask_of(opponent)
+        while m:
+            low = m & -m
+            if not (ADJACENT_MASKS[low.bit_length() - 1] & empty_mask):
+                ret += evals.BlockedOpponentSpot
+            m ^= low
+
+        return ret
+
+    def _eval_three(self, evals: EvalSettings) -> int:
+        opponent = Player.Black if self.my_player_turn == Player.White else Player.White
+        ret = 0
+
+        if self.has_won(opponent):
+            return evals.WorstScore
+
+        ret += evals.CapturedPiece * max(0, 9 - (self.my_placed[int(opponent)] + self.my_unplaced[int(opponent)]))
+
+        ret += evals.MillFormable * self._count_mills(Player.Neutral, self.my_player_turn)
+        ret += evals.MillBlocked * self._count_mills(self.my_player_turn, opponent)
+        return ret
+
+    def fill_the_board(
+        self,
+        figures: list[int] | tuple[int, ...],
+        computer_index: int,
+        human_index: int,
+        computer_unplaced: Optional[int] = None,
+        human_unplaced: Optional[int] = None,
+    ) -> None:
+        if len(figures) != 24:
+            raise ValueError("figures must be length 24")
+
+        self.my_masks = [0, 0]
+        for idx in range(24):
+            if figures[idx] == computer_index:
+                self.my_masks[int(Player.Black)] |= 1 << idx
+                self.my_placed[int(Player.Black)] += 1
+                self.my_unplaced[int(Player.Black)] -= 1
+            elif figures[idx] == human_index:
+                self.my_masks[int(Player.White)] |= 1 << idx
+                self.my_placed[int(Player.White)] += 1
+                self.my_unplaced[int(Player.White)] -= 1
+
+        self.my_player_turn = Player.Black
+
+        # Same overload semantics as `Board.fill_the_board()`.
+        if computer_unplaced is not None and human_unplaced is not None:
+            self.my_unplaced[int(Player.Black)] -= int(computer_unplaced)
+            self.my_unplaced[int(Player.White)] -= int(human_unplaced)
+
+        self.my_hash = self.compute_hash()
@@ -3,10 +3,30 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from .board_tables import DEGREE, MILL_LINES, MILL_PARTNERS, NEIGHBORS, POINT_LINES
 from .enums import BoardIndex, GameState, MoveType, Player
 from .eval_settings import EvalSettings
-from .move import Move, sort_moves_with_null_tail
+from .move import CAPTURE_BIT, NO_MOVE, Move, decode_move, encode_move
 from .position import Position
+from .zobrist import PIECE_KEYS, TURN_KEYS, UNPLACED_KEYS, position_key
+
+# Undo information returned by `Board.make_move()`: the move code, the player that
+# stood on the capture point (Neutral if none), the side that moved and the
+# Zobrist key before the move.
+UndoToken = tuple[int, Player, Player, int]
+
+# Evaluation tallies: each mill line is kept as a composition code
+# `white pieces * 4 + black pieces`, and a piece of player p moves it by _LINE_STEP[p].
+_LINE_STEP = (4, 1)
+_LINE_CODES = 16
+_NEUTRAL = Player.Neutral
+
+# Parts of the move codes (`encode_move()`) the generator puts together.
+_MOVE = int(MoveType.Move)
+_DROP_AND_CAPTURE = int(MoveType.DropAndCapture)
+_MOVE_AND_CAPTURE = int(MoveType.MoveAndCapture)
+_NO_START = 31 << 2
+_NO_CAPTURE = 31 << 12
 
 
 class Board:
@@ -33,6 +53,13 @@ class Board:
             self.my_placed[int(Player.Black)] = other.my_placed[int(Player.Black)]
             for i in range(24):
                 self.my_positions[i].player = other.my_positions[i].player
+            self.my_hash: int = other.my_hash
+            self._line_codes: list[int] = other._line_codes[:]
+            self._line_kinds: list[int] = other._line_kinds[:]
+            self._free_neighbors: list[int] = other._free_neighbors[:]
+            self._pieces: list[int] = other._pieces[:]
+            self._blocked_pieces: list[int] = other._blocked_pieces[:]
+            self._degree_sum: list[int] = other._degree_sum[:]
             return
 
         self.my_player_turn = Player(arg)
@@ -40,6 +67,8 @@ class Board:
         self.my_unplaced = [0, 0]
         self.my_placed = [0, 0]
         self._initialize()
+        self.my_hash = self.compute_hash()
+        self.compute_tallies()
 
     def dispose(self) -> None:
         for p in self.my_positions:
@@ -84,41 +113,127 @@ class Board:
         p[22].left = p[21]; p[22].right = p[23]; p[22].up = p[19]
         p[23].left = p[22]; p[23].up = p[14]
 
+    def player_at(self, index: BoardIndex) -> Player:
+        return self.my_positions[int(index)].player
+
+    def get_hash(self) -> int:
+        """64-bit Zobrist key of the position, maintained incrementally by every move."""
+        return self.my_hash
+
+    def compute_hash(self) -> int:
+        masks = [0, 0]
+        for i in range(24):
+            p = self.my_positions[i].player
+            if p != Player.Neutral:
+                masks[int(p)] |= 1 << i
+        return position_key(masks[0], masks[1], self.my_unplaced, self.my_player_turn)
+
+    def compute_tallies(self) -> None:
+        """Recount the evaluation tallies from scratch; moves keep them up to date incrementally.
+
+        Call it after setting `my_positions` directly (as `compute_hash()`).
+        The tallies are: per mill line its composition, and how many lines
+        have each composition; per point its empty neighbours; per player its
+        pieces on the board, how many of them are blocked and the sum of
+        their degrees.
+        """
+        p = self.my_positions
+        self._line_codes = [0] * len(MILL_LINES)
+        self._line_kinds = [0] * _LINE_CODES
+        for k, line in enumerate(MILL_LINES):
+            code = 0
+            for i in line:
+                if p[i].player != Player.Neutral:
+                    code += _LINE_STEP[int(p[i].player)]
+            self._line_codes[k] = code
+            self._line_kinds[code] += 1
+        self._free_neighbors = [sum(1 for n in NEIGHBORS[i] if p[n].player == Player.Neutral) for i in range(24)]
+        self._pieces = [0, 0]
+        self._blocked_pieces = [0, 0]
+        self._degree_sum = [0, 0]
+        for i in range(24):
+            if p[i].player == Player.Neutral:
+                continue
+            owner = int(p[i].player)
+            self._pieces[owner] += 1
+            self._degree_sum[owner] += DEGREE[i]
+            if self._free_neighbors[i] == 0:
+                self._blocked_pieces[owner] += 1
+
+    def _set_point(self, i: int, player: Player) -> None:
+        """Put `player` on point `i` (Neutral clears it), updating the evaluation tallies."""
+        p = self.my_positions
+        old = p[i].player
+        if old == player:
+            return
+        codes = self._line_codes
+        kinds = self._line_kinds
+        free = self._free_neighbors
+        blocked = self._blocked_pieces
+        h, v = POINT_LINES[i]
+
+        if old != _NEUTRAL:
+            step = _LINE_STEP[old]
+            code = codes[h]
+            kinds[code] -= 1
+            kinds[code - step] += 1
+            codes[h] = code - step
+            code = codes[v]
+            kinds[code] -= 1
+            kinds[code - step] += 1
+            codes[v] = code - step
+            self._pieces[old] -= 1
+            self._degree_sum[old] -= DEGREE[i]
+            if free[i] == 0:
+                blocked[old] -= 1
+            for n in NEIGHBORS[i]:
+                # The neighbour gains an empty point, so it is no longer blocked.
+                if free[n] == 0:
+                    owner = p[n].player
+                    if owner != _NEUTRAL:
+                        blocked[owner] -= 1
+                free[n] += 1
+
+        if player != _NEUTRAL:
+            step = _LINE_STEP[player]
+            code = codes[h]
+            kinds[code] -= 1
+            kinds[code + step] += 1
+            codes[h] = code + step
+            code = codes[v]
+            kinds[code] -= 1
+            kinds[code + step] += 1
+            codes[v] = code + step
+            self._pieces[player] += 1
+            self._degree_sum[player] += DEGREE[i]
+            for n in NEIGHBORS[i]:
+                free[n] -= 1
+                if free[n] == 0:
+                    owner = p[n].player
+                    if owner != _NEUTRAL:
+                        blocked[owner] += 1
+            if free[i] == 0:
+                blocked[player] += 1
+
+        p[i].player = player
+
     def _is_adjacent(self, start: BoardIndex, end: BoardIndex) -> bool:
-        s = self.my_positions[int(start)]
-        return (
-            (s.up is not None and s.up.location == end)
-            or (s.down is not None and s.down.location == end)
-            or (s.left is not None and s.left.location == end)
-            or (s.right is not None and s.right.location == end)
-        )
+        return int(end) in NEIGHBORS[int(start)]
 
+    # Mill tests look at the two other points of the line through `pos` (from
+    # `board_tables`); whoever stands on `pos` itself does not matter.
     def _is_vertical_mill(self, pos: BoardIndex, player: Player) -> bool:
-        p = self.my_positions[int(pos)]
-        if p.up is None:
-            assert p.down is not None and p.down.down is not None
-            return (p.down.player == p.down.down.player) and (p.down.player == player)
-        if p.down is None:
-            assert p.up is not None and p.up.up is not None
-            return (p.up.player == p.up.up.player) and (p.up.player == player)
-        assert p.up is not None and p.down is not None
-        return (p.up.player == p.down.player) and (p.up.player == player)
+        a, b = MILL_PARTNERS[int(pos)][1]
+        return self.my_positions[a].player == player and self.my_positions[b].player == player
 
     def _is_horizontal_mill(self, pos: BoardIndex, player: Player) -> bool:
-        p = self.my_positions[int(pos)]
-        if p.left is None:
-            assert p.right is not None and p.right.right is not None
-            return (p.right.player == p.right.right.player) and (p.right.player == player)
-        if p.right is None:
-            assert p.left is not None and p.left.left is not None
-            return (p.left.player == p.left.left.player) and (p.left.player == player)
-        assert p.left is not None and p.right is not None
-        return (p.left.player == p.right.player) and (p.left.player == player)
+        a, b = MILL_PARTNERS[int(pos)][0]
+        return self.my_positions[a].player == player and self.my_positions[b].player == player
 
     def _is_mill(self, pos: BoardIndex, player: Player) -> bool:
-        if self._is_vertical_mill(pos, player):
-            return True
-        return self._is_horizontal_mill(pos, player)
+        p = self.my_positions
+        (a, b), (c, d) = MILL_PARTNERS[int(pos)]
+        return (p[c].player == player and p[d].player == player) or (p[a].player == player and p[b].player == player)
 
     def _all_pieces_in_mills(self, player: Player) -> bool:
         pieces_in_mills = 0
@@ -127,73 +242,93 @@ class Board:
                 pieces_in_mills += 1
         return pieces_in_mills == self.my_placed[int(player)]
 
-    def _add_move_and_capture_moves(
-        self,
-        moves: list[Optional[Move]],
-        moves_generated: int,
-        start: BoardIndex,
-        end: BoardIndex,
-    ) -> int:
-        # Temporarily clear the start position.
-        self.my_positions[int(start)].set_player(Player.Neutral)
-
-        if self._is_mill(end, self.my_player_turn):
-            capture_moves = 0
-            capture_player = Player.Black if self.my_player_turn == Player.White else Player.White
+    def _forms_mill(self, end: int, player: Player, start: int) -> bool:
+        """Whether `player` closes a mill on `end` once its piece on `start` (-1 for a drop) has left."""
+        p = self.my_positions
+        (a, b), (c, d) = MILL_PARTNERS[end]
+        return (a != start and b != start and p[a].player == player and p[b].player == player) or (
+            c != start and d != start and p[c].player == player and p[d].player == player
+        )
 
+    def _add_capture_codes(self, moves: list[int], count: int, limit: int, base: int) -> int:
+        """Write `base` with every capturable opponent point into `moves[count:limit]`; return the new count."""
+        p = self.my_positions
+        capture_player = Player.Black if self.my_player_turn == Player.White else Player.White
+        first = count
+
+        for j in range(24):
+            if count >= limit:
+                break
+            if p[j].player == capture_player and not self._is_mill(j, capture_player):
+                moves[count] = base | j << 12
+                count += 1
+
+        # Exception rule: if all opponent pieces are in mills, allow capturing any.
+        if count == first:
             for j in range(24):
-                if (
-                    self.my_positions[j].player == capture_player
-                    and (not self._is_mill(BoardIndex(j), self.my_positions[j].player))
-                    and moves_generated < Board.MAX_MOVES
-                ):
-                    capture_moves += 1
-                    moves[moves_generated] = Move(
-                        MoveType.MoveAndCapture,
-                        start_position=start,
-                        end_position=end,
-                        capture_position=BoardIndex(j),
-                    )
-                    moves_generated += 1
-
-            # Exception rule: if all opponent pieces are in mills, allow capturing any.
-            if capture_moves == 0:
-                for j in range(24):
-                    if self.my_positions[j].player == capture_player and moves_generated < Board.MAX_MOVES:
-                        moves[moves_generated] = Move(
-                            MoveType.MoveAndCapture,
-                            start_position=start,
-                            end_position=end,
-                            capture_position=BoardIndex(j),
-                        )
-                        moves_generated += 1
-
-        elif moves_generated < Board.MAX_MOVES:
-            moves[moves_generated] = Move(MoveType.Move, start_position=start, end_position=end)
-            moves_generated += 1
-
-        # Restore.
-        self.my_positions[int(start)].set_player(self.my_player_turn)
-        return moves_generated
+                if count >= limit:
+                    break
+                if p[j].player == capture_player:
+                    moves[count] = base | j << 12
+                    count += 1
+        return count
 
     def move(self, move: Move) -> None:
-        t = move.get_move_type()
-        if t == MoveType.Drop:
-            self._drop(move.get_end_position())
-        elif t == MoveType.DropAndCapture:
-            self._drop(move.get_end_position())
-            self._capture(move.get_capture_position())
-        elif t == MoveType.Move:
-            self._move_positions(move.get_start_position(), move.get_end_position())
+        self.move_code(encode_move(move))
+
+    def move_code(self, code: int) -> None:
+        """`move()` for a move code (`encode_move()`)."""
+        end = code >> 7 & 31
+        # Type bit 0 is set for Move and MoveAndCapture, clear for the drops.
+        if code & 1:
+            self._move_positions(code >> 2 & 31, end)
         else:
-            self._move_positions(move.get_start_position(), move.get_end_position())
-            self._capture(move.get_capture_position())
+            self._drop(end)
+        if code & CAPTURE_BIT:
+            self._capture(code >> 12)
 
         self._change_turn()
 
-    def _move_positions(self, start: BoardIndex, end: BoardIndex) -> None:
-        self.my_positions[int(start)].set_player(Player.Neutral)
-        self.my_positions[int(end)].set_player(self.my_player_turn)
+    def make_move(self, move: Move) -> UndoToken:
+        """Play `move` in place and return the token `unmake_move()` needs to take it back."""
+        return self.make_move_code(encode_move(move))
+
+    def make_move_code(self, code: int) -> UndoToken:
+        """`make_move()` for a move code (`encode_move()`)."""
+        captured = self.my_positions[code >> 12].player if code & CAPTURE_BIT else _NEUTRAL
+        token = (code, captured, self.my_player_turn, self.my_hash)
+        self.move_code(code)
+        return token
+
+    def unmake_move(self, token: UndoToken) -> None:
+        """Restore the position from before the `make_move()` call that produced `token`."""
+        code, captured, mover, key = token
+        self.my_player_turn = mover
+        self.my_hash = key
+
+        if code & CAPTURE_BIT:
+            self._set_point(code >> 12, captured)
+            if captured != _NEUTRAL:
+                self.my_placed[captured] += 1
+
+        self._set_point(code >> 7 & 31, _NEUTRAL)
+        if code & 1:
+            self._set_point(code >> 2 & 31, mover)
+        else:
+            self.my_unplaced[mover] += 1
+            self.my_placed[mover] -= 1
+
+    def _move_positions(self, start: int, end: int) -> None:
+        s = self.my_positions[start]
+        e = self.my_positions[end]
+        if s.player != Player.Neutral:
+            self.my_hash ^= PIECE_KEYS[s.player][start]
+        if e.player != Player.Neutral:
+            self.my_hash ^= PIECE_KEYS[e.player][end]
+        self._set_point(start, Player.Neutral)
+        self._set_point(end, self.my_player_turn)
+        if self.my_player_turn != Player.Neutral:
+            self.my_hash ^= PIECE_KEYS[self.my_player_turn][end]
 
     def has_won(self, player: Player) -> bool:
         opponent = Player.Black if player == Player.White else Player.White
@@ -209,33 +344,31 @@ class Board:
         return self._blocked(opponent)
 
     def _blocked(self, player: Player) -> bool:
-        for i in range(24):
-            if self.my_positions[i].player != player:
-                continue
-            pos = self.my_positions[i]
-            if pos.up is not None and pos.up.player == Player.Neutral:
-                return False
-            if pos.down is not None and pos.down.player == Player.Neutral:
-                return False
-            if pos.left is not None and pos.left.player == Player.Neutral:
-                return False
-            if pos.right is not None and pos.right.player == Player.Neutral:
-                return False
-        return True
-
-    def _drop(self, pos: BoardIndex) -> None:
-        self.my_positions[int(pos)].player = self.my_player_turn
-        self.my_unplaced[int(self.my_player_turn)] -= 1
-        self.my_placed[int(self.my_player_turn)] += 1
-
-    def _capture(self, pos: BoardIndex) -> None:
-        capture_player = self.my_positions[int(pos)].player
-        self.my_positions[int(pos)].set_player(Player.Neutral)
-        if capture_player in (Player.White, Player.Black):
-            self.my_placed[int(capture_player)] -= 1
+        # No piece of `player` has an empty neighbour (also true with no pieces).
+        return self._blocked_pieces[int(player)] == self._pieces[int(player)]
+
+    def _drop(self, pos: int) -> None:
+        turn = self.my_player_turn
+        previous = self.my_positions[pos].player
+        if previous != Player.Neutral:
+            self.my_hash ^= PIECE_KEYS[previous][pos]
+        self._set_point(pos, turn)
+        self.my_hash ^= PIECE_KEYS[turn][pos] ^ UNPLACED_KEYS[turn][self.my_unplaced[turn]]
+        self.my_unplaced[turn] -= 1
+        self.my_placed[turn] += 1
+        self.my_hash ^= UNPLACED_KEYS[turn][self.my_unplaced[turn]]
+
+    def _capture(self, pos: int) -> None:
+        capture_player = self.my_positions[pos].player
+        self._set_point(pos, Player.Neutral)
+        if capture_player != Player.Neutral:
+            self.my_placed[capture_player] -= 1
+            self.my_hash ^= PIECE_KEYS[capture_player][pos]
 
     def _change_turn(self) -> None:
+        previous = self.my_player_turn
         self.my_player_turn = Player.Black if self.my_player_turn == Player.White else Player.White
+        self.my_hash ^= TURN_KEYS[int(previous)] ^ TURN_KEYS[int(self.my_player_turn)]
 
     def get_stage(self) -> GameState:
         if self.my_unplaced[int(Player.White)] > 0 or self.my_unplaced[int(Player.Black)] > 0:
@@ -245,85 +378,143 @@ class Board:
         return GameState.Two
 
     def get_moves(self) -> list[Optional[Move]]:
-        moves: list[Optional[Move]] = [None] * Board.MAX_MOVES
-        moves_generated = 0
+        codes = [NO_MOVE] * Board.MAX_MOVES
+        count = self.generate_moves(codes)
+        moves: list[Optional[Move]] = [decode_move(code) for code in codes[:count]]
+        return moves + [None] * (Board.MAX_MOVES - count)
+
+    def generate_moves(self, moves: list[int]) -> int:
+        """Write the codes (`encode_move()`) of the moves `get_moves()` returns into `moves`; return how many.
+
+        `moves` needs room for `MAX_MOVES` codes and can be reused between calls
+        (the search keeps one per ply). As in `get_moves()`, only the first
+        `MAX_MOVES` moves generated are kept, captures ahead of quiet moves and
+        each group in generation order.
+        """
+        captures, quiets = self._generate(moves, True)
+        if quiets:
+            limit = Board.MAX_MOVES
+            moves[captures : captures + quiets] = moves[limit - quiets : limit][::-1]
+        return captures + quiets
+
+    def generate_captures(self, moves: list[int]) -> tuple[int, int]:
+        """The capture half of `generate_moves()`: (captures written to the front of `moves`, length of the full list).
+
+        Quiet moves are only counted; `generate_quiets(moves, captures, total)`
+        adds them behind the captures, giving the same list as `generate_moves()`.
+        """
+        captures, quiets = self._generate(moves, False)
+        return captures, captures + quiets
+
+    def _generate(self, moves: list[int], write_quiets: bool) -> tuple[int, int]:
+        """(captures, quiet moves) among the first `MAX_MOVES` moves generated.
+
+        Captures fill `moves` from the front; with `write_quiets` quiet moves
+        fill it from the back, in reverse.
+        """
+        p = self.my_positions
+        turn = self.my_player_turn
+        limit = Board.MAX_MOVES
+        captures = 0
+        quiets = 0
 
         # Stage 1: enumerate all drops.
-        if self.my_unplaced[int(self.my_player_turn)] > 0:
+        if self.my_unplaced[turn] > 0:
             for idx in range(24):
-                if self.my_positions[idx].player != Player.Neutral:
+                if p[idx].player != _NEUTRAL:
                     continue
-
-                if self._is_mill(BoardIndex(idx), self.my_player_turn):
-                    capture_player = Player.Black if self.my_player_turn == Player.White else Player.White
-                    capture_moves = 0
-
-                    for j in range(24):
-                        if (
-                            self.my_positions[j].player == capture_player
-                            and (not self._is_mill(BoardIndex(j), self.my_positions[j].player))
-                            and moves_generated < Board.MAX_MOVES
-                        ):
-                            capture_moves += 1
-                            moves[moves_generated] = Move(
-                                MoveType.DropAndCapture,
-                                end_position=BoardIndex(idx),
-                                capture_position=BoardIndex(j),
-                            )
-                            moves_generated += 1
-
-                    if capture_moves == 0:
-                        for j in range(24):
-                            if self.my_positions[j].player == capture_player and moves_generated < Board.MAX_MOVES:
-                                moves[moves_generated] = Move(
-                                    MoveType.DropAndCapture,
-                                    end_position=BoardIndex(idx),
-                                    capture_position=BoardIndex(j),
-                                )
-                                moves_generated += 1
-
-                elif moves_generated < Board.MAX_MOVES:
-                    moves[moves_generated] = Move(MoveType.Drop, end_position=BoardIndex(idx))
-                    moves_generated += 1
-
-        # Stage 2: adjacent moves.
-        elif self.my_placed[int(self.my_player_turn)] > 3:
-            for idx in range(24):
-                if self.my_positions[idx].player != self.my_player_turn:
-                    continue
-
-                pos = self.my_positions[idx]
-                if pos.up is not None and pos.up.player == Player.Neutral:
-                    moves_generated = self._add_move_and_capture_moves(
-                        moves, moves_generated, BoardIndex(idx), pos.up.get_location()
-                    )
-                if pos.down is not None and pos.down.player == Player.Neutral:
-                    moves_generated = self._add_move_and_capture_moves(
-                        moves, moves_generated, BoardIndex(idx), pos.down.get_location()
-                    )
-                if pos.left is not None and pos.left.player == Player.Neutral:
-                    moves_generated = self._add_move_and_capture_moves(
-                        moves, moves_generated, BoardIndex(idx), pos.left.get_location()
-                    )
-                if pos.right is not None and pos.right.player == Player.Neutral:
-                    moves_generated = self._add_move_and_capture_moves(
-                        moves, moves_generated, BoardIndex(idx), pos.right.get_location()
+                if self._forms_mill(idx, turn, -1):
+                    captures = self._add_capture_codes(
+                        moves, captures, limit - quiets, _DROP_AND_CAPTURE | _NO_START | idx << 7
                     )
+                elif captures + quiets < limit:
+                    quiets += 1
+                    if write_quiets:
+                        moves[limit - quiets] = _NO_START | idx << 7 | _NO_CAPTURE
 
-        # Stage 3: flying.
+        # Stage 2: adjacent moves; stage 3: flying to any empty point.
         else:
+            flying = self.my_placed[turn] <= 3
             for idx in range(24):
-                if self.my_positions[idx].player != self.my_player_turn:
+                if p[idx].player != turn:
                     continue
-                for j in range(24):
-                    if self.my_positions[j].player == Player.Neutral:
-                        moves_generated = self._add_move_and_capture_moves(
-                            moves, moves_generated, BoardIndex(idx), BoardIndex(j)
+                for n in range(24) if flying else NEIGHBORS[idx]:
+                    if p[n].player != _NEUTRAL:
+                        continue
+                    if self._forms_mill(n, turn, idx):
+                        captures = self._add_capture_codes(
+                            moves, captures, limit - quiets, _MOVE_AND_CAPTURE | idx << 2 | n << 7
                         )
+                    elif captures + quiets < limit:
+                        quiets += 1
+                        if write_quiets:
+                            moves[limit - quiets] = _MOVE | idx << 2 | n << 7 | _NO_CAPTURE
 
-        return sort_moves_with_null_tail(moves, Board.MAX_MOVES)
+        return captures, quiets
+
+    def generate_quiets(self, moves: list[int], count: int, limit: int) -> int:
+        """Write quiet move codes (Drop, Move) in generation order into `moves[count:limit]`; return the new count."""
+        p = self.my_positions
+        turn = self.my_player_turn
+
+        if self.my_unplaced[turn] > 0:
+            for idx in range(24):
+                if count >= limit:
+                    break
+                if p[idx].player == _NEUTRAL and not self._forms_mill(idx, turn, -1):
+                    moves[count] = _NO_START | idx << 7 | _NO_CAPTURE
+                    count += 1
+            return count
+
+        flying = self.my_placed[turn] <= 3
+        for idx in range(24):
+            if p[idx].player != turn:
+                continue
+            for n in range(24) if flying else NEIGHBORS[idx]:
+                if count >= limit:
+                    return count
+                if p[n].player == _NEUTRAL and not self._forms_mill(n, turn, idx):
+                    moves[count] = _MOVE | idx << 2 | n << 7 | _NO_CAPTURE
+                    count += 1
+        return count
+
+    def is_legal_code(self, code: int) -> bool:
+        """Whether move code `code` is a legal move here, checked against the rules without generating moves.
+
+        Meant for moves from elsewhere (transposition table, killers); unlike
+        `generate_moves()` it does not apply the `MAX_MOVES` cut.
+        """
+        p = self.my_positions
+        turn = self.my_player_turn
+        start = code >> 2 & 31
+        end = code >> 7 & 31
+        capture = code >> 12
+        if end >= 24 or p[end].player != _NEUTRAL:
+            return False
+        if self.my_unplaced[turn] > 0:
+            if code & 1 or start != 31:
+                return False
+            start = -1
+        elif not code & 1 or start >= 24 or p[start].player != turn:
+            return False
+        elif self.my_placed[turn] > 3 and end not in NEIGHBORS[start]:
+            return False
+
+        if not self._forms_mill(end, turn, start):
+            return not code & CAPTURE_BIT and capture == 31
+        opponent = Player.Black if turn == Player.White else Player.White
+        if not code & CAPTURE_BIT or capture >= 24 or p[capture].player != opponent:
+            return False
+        # A piece in a mill can only be taken when every opponent piece is in one.
+        return not self._is_mill(capture, opponent) or self._all_pieces_in_mills(opponent)
 
     def is_same_board_state(self, other: "Board") -> bool:
+        # O(1) reject: the keys differ unless placement and unplaced counts match
+        # (the side to move is factored out, as before it is not compared).
+        if (self.my_hash ^ TURN_KEYS[int(self.my_player_turn)]) != (
+            other.get_hash() ^ TURN_KEYS[int(other.my_player_turn)]
+        ):
+            return False
         if self.my_placed[int(Player.White)] != other.my_placed[int(Player.White)]:
             return False
         if self.my_placed[int(Player.Black)] != other.my_placed[int(Player.Black)]:
@@ -333,56 +524,17 @@ class Board:
         if self.my_unplaced[int(Player.Black)] != other.my_unplaced[int(Player.Black)]:
             return False
         for i in range(24):
-            if self.my_positions[i].player != other.my_positions[i].player:
+            if self.my_positions[i].player != other.player_at(BoardIndex(i)):
                 return False
         return True
 
     def _count_mills(self, start_player: Player, player: Player) -> int:
-        ret = 0
-        loc_in_h = [False] * 24
-        loc_in_v = [False] * 24
-
-        for idx in range(24):
-            if self.my_positions[idx].player != start_player:
-                continue
-
-            if (not loc_in_h[idx]) and self._is_horizontal_mill(BoardIndex(idx), player):
-                loc_in_h[idx] = True
-                ret += 1
-
-                pos = self.my_positions[idx]
-                if pos.left is None:
-                    assert pos.right is not None and pos.right.right is not None
-                    loc_in_h[int(pos.right.get_location())] = True
-                    loc_in_h[int(pos.right.right.get_location())] = True
-                elif pos.right is None:
-                    assert pos.left is not None and pos.left.left is not None
-                    loc_in_h[int(pos.left.get_location())] = True
-                    loc_in_h[int(pos.left.left.get_location())] = True
-                else:
-                    assert pos.left is not None and pos.right is not None
-                    loc_in_h[int(pos.right.get_location())] = True
-                    loc_in_h[int(pos.left.get_location())] = True
-
-            if (not loc_in_v[idx]) and self._is_vertical_mill(BoardIndex(idx), player):
-                loc_in_v[idx] = True
-                ret += 1
-
-                pos = self.my_positions[idx]
-                if pos.up is None:
-                    assert pos.down is not None and pos.down.down is not None
-                    loc_in_v[int(pos.down.get_location())] = True
-                    loc_in_v[int(pos.down.down.get_location())] = True
-                elif pos.down is None:
-                    assert pos.up is not None and pos.up.up is not None
-                    loc_in_v[int(pos.up.get_location())] = True
-                    loc_in_v[int(pos.up.up.get_location())] = True
-                else:
-                    assert pos.up is not None and pos.down is not None
-                    loc_in_v[int(pos.down.get_location())] = True
-                    loc_in_v[int(pos.up.get_location())] = True
-
-        return ret
+        # Mill lines with a `start_player` point whose two other points are `player`'s,
+        # i.e. the lines made of two `player` points and one `start_player` point.
+        counts = [0, 0, 0]
+        counts[int(player)] += 2
+        counts[int(start_player)] += 1
+        return self._line_kinds[counts[int(Player.White)] * 4 + counts[int(Player.Black)]]
 
     def evaluate(self, evals: EvalSettings) -> int:
         stage = self.get_stage()
@@ -392,31 +544,19 @@ class Board:
             return self._eval_two(evals)
         return self._eval_three(evals)
 
+    def _missing(self, player: Player) -> int:
+        """Pieces `player` has lost so far (nine minus those placed and unplaced)."""
+        return max(0, 9 - (self.my_placed[int(player)] + self.my_unplaced[int(player)]))
+
+    # The evaluation terms read the tallies `_set_point()` keeps, so each stage is O(1).
     def _eval_one(self, evals: EvalSettings) -> int:
         opponent = Player.Black if self.my_player_turn == Player.White else Player.White
         ret = 0
 
         ret += evals.MillBlocked * self._count_mills(self.my_player_turn, opponent)
-
-        for i in range(24):
-            if self.my_positions[i].player != self.my_player_turn:
-                continue
-            pos = self.my_positions[i]
-            if pos.up is not None:
-                ret += evals.AdjacentSpot
-            if pos.down is not None:
-                ret += evals.AdjacentSpot
-            if pos.left is not None:
-                ret += evals.AdjacentSpot
-            if pos.right is not None:
-                ret += evals.AdjacentSpot
-
-        for _i in range(9, (self.my_placed[int(opponent)] + self.my_unplaced[int(opponent)]), -1):
-            ret += evals.CapturedPiece
-
-        for _i in range(9, (self.my_placed[int(self.my_player_turn)] + self.my_unplaced[int(self.my_player_turn)]), -1):
-            ret += evals.LostPiece
-
+        ret += evals.AdjacentSpot * self._degree_sum[int(self.my_player_turn)]
+        ret += evals.CapturedPiece * self._missing(opponent)
+        ret += evals.LostPiece * self._missing(self.my_player_turn)
         ret += evals.MillOpponent * self._count_mills(opponent, opponent)
         return ret
 
@@ -430,34 +570,12 @@ class Board:
         if self.has_won(self.my_player_turn):
             return evals.BestScore
 
-        for _i in range(9, (self.my_placed[int(opponent)] + self.my_unplaced[int(opponent)]), -1):
-            ret += evals.CapturedPiece
-
-        for _i in range(9, (self.my_placed[int(self.my_player_turn)] + self.my_unplaced[int(self.my_player_turn)]), -1):
-            ret += evals.LostPiece
-
+        ret += evals.CapturedPiece * self._missing(opponent)
+        ret += evals.LostPiece * self._missing(self.my_player_turn)
         ret += evals.MillFormable * self._count_mills(Player.Neutral, self.my_player_turn)
         ret += evals.MillFormed * self._count_mills(self.my_player_turn, self.my_player_turn)
         ret += evals.MillOpponent * self._count_mills(opponent, opponent)
-
-        for i in range(24):
-            if self.my_positions[i].player != opponent:
-                continue
-
-            pos = self.my_positions[i]
-            blocked = True
-            if pos.up is not None and pos.up.player == Player.Neutral:
-                blocked = False
-            elif pos.down is not None and pos.down.player == Player.Neutral:
-                blocked = False
-            elif pos.left is not None and pos.left.player == Player.Neutral:
-                blocked = False
-            elif pos.right is not None and pos.right.player == Player.Neutral:
-                blocked = False
-
-            if blocked:
-                ret += evals.BlockedOpponentSpot
-
+        ret += evals.BlockedOpponentSpot * self._blocked_pieces[int(opponent)]
         return ret
 
     def _eval_three(self, evals: EvalSettings) -> int:
@@ -467,9 +585,7 @@ class Board:
         if self.has_won(opponent):
             return evals.WorstScore
 
-        for _i in range(9, (self.my_placed[int(opponent)] + self.my_unplaced[int(opponent)]), -1):
-            ret += evals.CapturedPiece
-
+        ret += evals.CapturedPiece * self._missing(opponent)
         ret += evals.MillFormable * self._count_mills(Player.Neutral, self.my_player_turn)
         ret += evals.MillBlocked * self._count_mills(self.my_player_turn, opponent)
         return ret
@@ -503,3 +619,6 @@ class Board:
         if computer_unplaced is not None and human_unplaced is not None:
             self.my_unplaced[int(Player.Black)] -= int(computer_unplaced)
             self.my_unplaced[int(Player.White)] -= int(human_unplaced)
+
+        self.my_hash = self.compute_hash()
+        self.compute_tallies()
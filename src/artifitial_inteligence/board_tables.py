@@ -0,0 +1,113 @@
+"""Static lookup tables for the 24-point Nine Men's Morris board.
+
+Everything here is derived once at import time from the same adjacency map that
+`Board._initialize()` wires up, so table-driven code and the linked `Position`
+graph always agree on neighbors and mill lines.
+
+Bit `i` of a mask corresponds to `BoardIndex(i)`.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+# Adjacency per point as (up, down, left, right), ported from `Board._initialize()`.
+_LINKS: tuple[tuple[Optional[int], Optional[int], Optional[int], Optional[int]], ...] = (
+    (None, 9, None, 1),  # A1
+    (None, 4, 0, 2),  # D1
+    (None, 14, 1, None),  # G1
+    (None, 10, None, 4),  # B2
+    (1, 7, 3, 5),  # D2
+    (None, 13, 4, None),  # F2
+    (None, 11, None, 7),  # C3
+    (4, None, 6, 8),  # D3
+    (None, 12, 7, None),  # E3
+    (0, 21, None, 10),  # A4
+    (3, 18, 9, 11),  # B4
+    (6, 15, 10, None),  # C4
+    (8, 17, None, 13),  # E4
+    (5, 20, 12, 14),  # F4
+    (2, 23, 13, None),  # G4
+    (11, None, None, 16),  # C5
+    (None, 19, 15, 17),  # D5
+    (12, None, 16, None),  # E5
+    (10, None, None, 19),  # B6
+    (16, 22, 18, 20),  # D6
+    (13, None, 19, None),  # F6
+    (9, None, None, 22),  # A7
+    (19, None, 21, 23),  # D7
+    (14, None, 22, None),  # G7
+)
+
+POINT_COUNT = 24
+FULL_MASK = (1 << POINT_COUNT) - 1
+
+# Neighbor indices per point, in the up/down/left/right order `Board.get_moves()` visits them.
+NEIGHBORS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(n for n in links if n is not None) for links in _LINKS
+)
+
+ADJACENT_MASKS: tuple[int, ...] = tuple(sum(1 << n for n in ns) for ns in NEIGHBORS)
+
+DEGREE: tuple[int, ...] = tuple(len(ns) for ns in NEIGHBORS)
+
+
+def _line_through(point: int, back: int, forward: int) -> tuple[int, int, int]:
+    # Walk to the start of the line, then collect three points along it.
+    p = point
+    while _LINKS[p][back] is not None:
+        p = _LINKS[p][back]  # type: ignore[assignment]
+    a = p
+    b = _LINKS[a][forward]
+    assert b is not None
+    c = _LINKS[b][forward]
+    assert c is not None
+    return (a, b, c)
+
+
+def _build_lines() -> tuple[tuple[int, int, int], ...]:
+    horizontal: list[tuple[int, int, int]] = []
+    vertical: list[tuple[int, int, int]] = []
+    for i in range(POINT_COUNT):
+        h = _line_through(i, 2, 3)
+        if h not in horizontal:
+            horizontal.append(h)
+        v = _line_through(i, 0, 1)
+        if v not in vertical:
+            vertical.append(v)
+    return tuple(horizontal + vertical)
+
+
+# The 16 mill lines: 8 horizontal followed by 8 vertical.
+MILL_LINES: tuple[tuple[int, int, int], ...] = _build_lines()
+
+MILL_MASKS: tuple[int, ...] = tuple((1 << a) | (1 << b) | (1 << c) for a, b, c in MILL_LINES)
+
+# The two mill lines (horizontal, vertical) through each point, as indices into `MILL_LINES`.
+POINT_LINES: tuple[tuple[int, int], ...] = tuple(
+    (
+        next(k for k in range(8) if i in MILL_LINES[k]),
+        next(k for k in range(8, 16) if i in MILL_LINES[k]),
+    )
+    for i in range(POINT_COUNT)
+)
+
+# Masks of the two *other* points on the (horizontal, vertical) line through each point.
+# A piece at `i` is in a mill for a player when either partner mask is fully owned by them.
+MILL_PARTNER_MASKS: tuple[tuple[int, int], ...] = tuple(
+    (
+        MILL_MASKS[POINT_LINES[i][0]] & ~(1 << i),
+        MILL_MASKS[POINT_LINES[i][1]] & ~(1 << i),
+    )
+    for i in range(POINT_COUNT)
+)
+
+# Indices of the two *other* points on the (horizontal, vertical) line through each point,
+# for `Board`, which compares the players standing on them.
+MILL_PARTNERS: tuple[tuple[tuple[int, int], tuple[int, int]], ...] = tuple(
+    (
+        tuple(q for q in MILL_LINES[POINT_LINES[i][0]] if q != i),  # type: ignore[misc]
+        tuple(q for q in MILL_LINES[POINT_LINES[i][1]] if q != i),  # type: ignore[misc]
+    )
+    for i in range(POINT_COUNT)
+)
@@ -0,0 +1,486 @@
+"""Endgame database: exact values for positions after the placement stage.
+
+Once both players have placed all their pieces, a position is fully described
+by the two piece masks and the side to move, so each material signature
+(white pieces, black pieces) has a finite state space. `endgame_builder`
+solves a signature by retrograde analysis and writes one file per signature;
+`EndgameDatabase` reads them back and answers probes.
+
+Positions of a signature are numbered by a perfect index: the colex rank of
+the white mask among all `white`-subsets of the 24 points, then the colex rank
+of the black mask among the points white leaves free, then the side to move. A table written with
+`symmetric` keeps only the white masks that are their own canonical image
+(`symmetry.canonical_white()`), in the same order; a position is looked up
+through the symmetry that makes its white mask canonical, which holds the
+same value, so the file is about 1/13 of the size.
+Each entry is a small code for the side to move: 0 = draw, `2d + 1` = win in
+`d` plies, `2d + 2` = loss in `d` plies. The rules are those of `Board`,
+including its end-of-game test (`has_won()`): the side to move has lost when
+all its pieces are blocked by adjacency (even with three), and has won when
+the opponent is. Move lists are not truncated to `Board.MAX_MOVES`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from functools import lru_cache
+from math import comb
+from typing import Iterator, Optional, Sequence
+
+from .bit_board import BitBoard
+from .board import Board
+from .board_tables import ADJACENT_MASKS, FULL_MASK, MILL_PARTNER_MASKS, POINT_COUNT
+from .enums import BoardIndex, EndgameResult, MoveType, Player
+from .eval_settings import EvalSettings
+from .models.endgame_entry import EndgameEntry
+from .move import Move
+from .symmetry import board_masks, canonical_white, transform_mask
+
+# Smallest army that is still in the game (`Board.has_won()`), and the largest one.
+MIN_PIECES = 3
+MAX_PIECES = 9
+
+# Entry codes shared with `endgame_builder`.
+DRAW = 0
+WIN_NOW = 1  # the opponent is blocked
+LOSS_NOW = 2  # the side to move is blocked
+
+# Distance reported by tables built with `wdl_only` (longer than any real one).
+UNKNOWN_DISTANCE = 1000
+
+# File layout: a 32-byte header, then the entries packed `bits` to a byte-aligned
+# unit (entry i of a 4-bit table is the low nibble of byte i // 2 when i is even).
+_MAGIC = b"NMMEGDB2"
+_HEADER = struct.Struct("<8sBBBBQ12x")
+_FLAG_WDL = 1
+_FLAG_SYMMETRIC = 2
+_FILE_RE = re.compile(r"^nmm_(\d)v(\d)\.egdb$")
+
+Signature = tuple[int, int]  # (white pieces, black pieces)
+
+
+def table_file_name(signature: Signature) -> str:
+    return f"nmm_{signature[0]}v{signature[1]}.egdb"
+
+
+def signature_size(signature: Signature) -> int:
+    """Number of positions (both sides to move) of a material signature."""
+    white, black = signature
+    return 2 * comb(POINT_COUNT, white) * comb(POINT_COUNT - white, black)
+
+
+@lru_cache(maxsize=None)
+def masks_with_count(count: int) -> tuple[int, ...]:
+    """All 24-bit masks with `count` bits set, in colex order (which is numeric order)."""
+    out = []
+    if count == 0:
+        return (0,)
+    mask = (1 << count) - 1
+    while mask <= FULL_MASK:
+        out.append(mask)
+        # Gosper's hack: next larger integer with the same number of bits.
+        low = mask & -mask
+        ripple = mask + low
+        mask = ripple | (((mask ^ ripple) >> 2) // low)
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def mask_ranks(count: int) -> dict[int, int]:
+    """Colex rank of each mask in `masks_with_count(count)`; independent of the universe size."""
+    return {mask: rank for rank, mask in enumerate(masks_with_count(count))}
+
+
+def compress(mask: int, free: int) -> int:
+    """Gather the bits of `mask` that lie on `free` into the low bits (parallel bit extract)."""
+    out = 0
+    while mask:
+        low = mask & -mask
+        out |= 1 << (free & (low - 1)).bit_count()
+        mask ^= low
+    return out
+
+
+def expand(compressed: int, free: int) -> int:
+    """Inverse of `compress()`: scatter the low bits onto the set bits of `free`."""
+    out = 0
+    while compressed:
+        f = free & -free
+        if compressed & 1:
+            out |= f
+        free ^= f
+        compressed >>= 1
+    return out
+
+
+def position_index(white_mask: int, black_mask: int, turn: Player) -> int:
+    """Index of a position within the table of its material signature."""
+    white = white_mask.bit_count()
+    black = black_mask.bit_count()
+    per_white = comb(POINT_COUNT - white, black)
+    white_rank = mask_ranks(white)[white_mask]
+    black_rank = mask_ranks(black)[compress(black_mask, FULL_MASK & ~white_mask)]
+    return (int(turn) * comb(POINT_COUNT, white) + white_rank) * per_white + black_rank
+
+
+@lru_cache(maxsize=None)
+def canonical_white_rows(count: int) -> tuple[array, int]:
+    """Row of each white rank in a symmetric table (-1 if not canonical), and the number of rows."""
+    rows = array("i", [-1]) * comb(POINT_COUNT, count)
+    found = 0
+    for rank, mask in enumerate(masks_with_count(count)):
+        if canonical_white(mask)[0] == mask:
+            rows[rank] = found
+            found += 1
+    return rows, found
+
+
+def symmetric_signature_size(signature: Signature) -> int:
+    """Number of positions stored in a symmetric table of `signature`."""
+    white, black = signature
+    return 2 * canonical_white_rows(white)[1] * comb(POINT_COUNT - white, black)
+
+
+def symmetric_position_index(white_mask: int, black_mask: int, turn: Player) -> int:
+    """Index of a position within a symmetric table of its material signature."""
+    white_mask, symmetry = canonical_white(white_mask)
+    black_mask = transform_mask(black_mask, symmetry)
+    white = white_mask.bit_count()
+    black = black_mask.bit_count()
+    rows, row_count = canonical_white_rows(white)
+    row = rows[mask_ranks(white)[white_mask]]
+    black_rank = mask_ranks(black)[compress(black_mask, FULL_MASK & ~white_mask)]
+    return (int(turn) * row_count + row) * comb(POINT_COUNT - white, black) + black_rank
+
+
+def symmetric_codes(signature: Signature, codes: Sequence[int]) -> array:
+    """The entries of a full table (in `position_index()` order) that a symmetric table keeps."""
+    white, black = signature
+    per_white = comb(POINT_COUNT - white, black)
+    rows, _ = canonical_white_rows(white)
+    white_count = len(rows)
+    out = array("H")
+    for turn in (0, 1):
+        for rank, row in enumerate(rows):
+            if row >= 0:
+                start = (turn * white_count + rank) * per_white
+                out.extend(codes[start : start + per_white])
+    return out
+
+
+def position_at(signature: Signature, index: int) -> tuple[int, int, Player]:
+    """Inverse of `position_index()`: (white mask, black mask, side to move)."""
+    white, black = signature
+    per_white = comb(POINT_COUNT - white, black)
+    index, black_rank = divmod(index, per_white)
+    turn, white_rank = divmod(index, comb(POINT_COUNT, white))
+    white_mask = masks_with_count(white)[white_rank]
+    black_mask = expand(masks_with_count(black)[black_rank], FULL_MASK & ~white_mask)
+    return white_mask, black_mask, Player(turn)
+
+
+def decode_entry(code: int) -> EndgameEntry:
+    if code == DRAW:
+        return EndgameEntry(EndgameResult.Draw, 0)
+    result = EndgameResult.Win if code & 1 else EndgameResult.Loss
+    distance = (code - 1) >> 1
+    return EndgameEntry(result, None if distance == UNKNOWN_DISTANCE else distance)
+
+
+def blocked(own: int, empty: int) -> bool:
+    """`Board._blocked()` on masks: no piece of `own` has an empty neighbour."""
+    while own:
+        low = own & -own
+        if ADJACENT_MASKS[low.bit_length() - 1] & empty:
+            return False
+        own ^= low
+    return True
+
+
+def terminal_code(own: int, opp: int) -> int:
+    """WIN_NOW / LOSS_NOW if the game is already over (side to move owns `own`), else DRAW."""
+    empty = FULL_MASK & ~(own | opp)
+    if blocked(own, empty):
+        return LOSS_NOW
+    if blocked(opp, empty):
+        return WIN_NOW
+    return DRAW
+
+
+def _forms_mill(index: int, mask: int) -> bool:
+    h, v = MILL_PARTNER_MASKS[index]
+    return (h & mask) == h or (v & mask) == v
+
+
+def capturable(opp: int) -> int:
+    """Opponent pieces that may be captured: those outside mills, or any if all are in mills."""
+    free = 0
+    m = opp
+    while m:
+        low = m & -m
+        if not _forms_mill(low.bit_length() - 1, opp):
+            free |= low
+        m ^= low
+    return free or opp
+
+
+def successors(own: int, opp: int) -> Iterator[tuple[Move, int, int]]:
+    """Every move of the side owning `own`, as (move, own after, opp after), in `BitBoard` scan order."""
+    empty = FULL_MASK & ~(own | opp)
+    flying = own.bit_count() <= MIN_PIECES
+    m = own
+    while m:
+        low = m & -m
+        start = low.bit_length() - 1
+        m ^= low
+        rest = own ^ low
+        targets = empty if flying else ADJACENT_MASKS[start] & empty
+        while targets:
+            t = targets & -targets
+            end = t.bit_length() - 1
+            targets ^= t
+            if _forms_mill(end, rest):
+                c = capturable(opp)
+                while c:
+                    cap = c & -c
+                    c ^= cap
+                    yield (
+                        Move(MoveType.MoveAndCapture, BoardIndex(start), BoardIndex(end), BoardIndex(cap.bit_length() - 1)),
+                        rest | t,
+                        opp ^ cap,
+                    )
+            else:
+                yield Move(MoveType.Move, BoardIndex(start), BoardIndex(end)), rest | t, opp
+
+
+def pack_codes(codes: Sequence[int], bits: int) -> bytes:
+    """Pack entry codes little-end first into `bits` (2, 4, 8 or 16) bits each."""
+    if bits == 16:
+        wide = array("H", codes)
+        if sys.byteorder == "big":
+            wide.byteswap()
+        return wide.tobytes()
+    if bits == 8:
+        return array("B", codes).tobytes()
+    per_byte = 8 // bits
+    out = bytearray(array("B", codes[0::per_byte]).tobytes())
+    for k in range(1, per_byte):
+        shift = k * bits
+        for i, code in enumerate(codes[k::per_byte]):
+            out[i] |= code << shift
+    return bytes(out)
+
+
+def write_table(
+    path: str,
+    signature: Signature,
+    codes: Sequence[int],
+    wdl_only: bool = False,
+    symmetric: bool = False,
+) -> int:
+    """Write one signature's table; returns the bits per entry used.
+
+    Entries take the narrowest of 2, 4 or 8 bits that holds the largest code
+    (16 if distances run past 126 plies). `wdl_only` drops the distances and
+    always packs 2 bits per entry: such tables score positions but cannot pick
+    moves or seed larger tables. `symmetric` keeps only the canonical white
+    masks (see the module docstring).
+    """
+    if symmetric:
+        codes = symmetric_codes(signature, codes)
+    if wdl_only:
+        codes = [code if code <= LOSS_NOW else LOSS_NOW - (code & 1) for code in codes]
+    top = max(codes, default=0)
+    bits = next(b for b in (2, 4, 8, 16) if top < 1 << b)
+    flags = (_FLAG_WDL if wdl_only else 0) | (_FLAG_SYMMETRIC if symmetric else 0)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, signature[0], signature[1], bits, flags, len(codes)))
+        f.write(pack_codes(codes, bits))
+    os.replace(tmp, path)
+    return bits
+
+
+class _Table:
+    """One signature's file, mapped read-only; lookups read the page cache in place."""
+
+    __slots__ = ("signature", "bits", "wdl_only", "symmetric", "count", "_file", "_map")
+
+    def __init__(self, path: str, signature: Signature):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        magic, white, black, bits, flags, count = _HEADER.unpack_from(self._map, 0)
+        self.signature = signature
+        self.bits = bits
+        self.wdl_only = bool(flags & _FLAG_WDL)
+        self.symmetric = bool(flags & _FLAG_SYMMETRIC)
+        self.count = count
+        if magic != _MAGIC or (white, black) != signature or bits not in (2, 4, 8, 16):
+            self.close()
+            raise ValueError(f"{path}: not an endgame table for {signature[0]}v{signature[1]}")
+        size = symmetric_signature_size(signature) if self.symmetric else signature_size(signature)
+        if count != size or len(self._map) < _HEADER.size + (count * bits + 7) // 8:
+            self.close()
+            raise ValueError(f"{path}: truncated or wrong size for {signature[0]}v{signature[1]}")
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __getitem__(self, index: int) -> int:
+        bits = self.bits
+        if bits == 8:
+            code = self._map[_HEADER.size + index]
+        elif bits == 16:
+            offset = _HEADER.size + 2 * index
+            code = self._map[offset] | self._map[offset + 1] << 8
+        else:
+            per_byte = 8 // bits
+            code = (self._map[_HEADER.size + index // per_byte] >> ((index % per_byte) * bits)) & ((1 << bits) - 1)
+        if self.wdl_only and code:
+            # No distance stored: report it as `UNKNOWN_DISTANCE`, which keeps the parity.
+            return 2 * UNKNOWN_DISTANCE + (1 if code & 1 else 2)
+        return code
+
+
+class EndgameDatabase:
+    """Reader for a directory of endgame tables, one file per material signature.
+
+    Each table is memory-mapped read-only on first use and probed in place, so
+    processes that open the same directory share one copy through the OS page
+    cache. Only positions with nothing left to place are covered; everything
+    else probes as None.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = os.fspath(directory)
+        self._tables: dict[Signature, Optional[_Table]] = {}
+
+    def close(self) -> None:
+        """Unmap every open table (they are reopened on the next probe)."""
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        self._tables = {}
+
+    def __getstate__(self) -> dict:
+        # Maps are per process: a copy sent to a worker reopens its tables lazily.
+        return {"directory": self.directory}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["directory"])
+
+    def signatures(self) -> list[Signature]:
+        """Signatures with a table file in the directory."""
+        found = []
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                match = _FILE_RE.match(name)
+                if match:
+                    found.append((int(match.group(1)), int(match.group(2))))
+        return sorted(found)
+
+    def has(self, signature: Signature) -> bool:
+        return self._table(signature) is not None
+
+    def has_distances(self, signature: Signature) -> bool:
+        """True if the signature's table stores distances (was not built `wdl_only`)."""
+        table = self._table(signature)
+        return table is not None and not table.wdl_only
+
+    def _table(self, signature: Signature) -> Optional[_Table]:
+        if signature not in self._tables:
+            path = os.path.join(self.directory, table_file_name(signature))
+            self._tables[signature] = _Table(path, signature) if os.path.exists(path) else None
+        return self._tables[signature]
+
+    def code(self, white_mask: int, black_mask: int, turn: Player) -> Optional[int]:
+        """Raw entry code of a position, or None when its signature has no table.
+
+        A side with fewer than three pieces has already lost; that is answered
+        without a table.
+        """
+        own, opp = (white_mask, black_mask) if turn == Player.White else (black_mask, white_mask)
+        if own.bit_count() < MIN_PIECES:
+            return LOSS_NOW
+        if opp.bit_count() < MIN_PIECES:
+            return WIN_NOW
+        table = self._table((white_mask.bit_count(), black_mask.bit_count()))
+        if table is None:
+            return None
+        if table.symmetric:
+            return table[symmetric_position_index(white_mask, black_mask, turn)]
+        return table[position_index(white_mask, black_mask, turn)]
+
+    def _board_code(self, board: Board | BitBoard) -> Optional[int]:
+        if board.my_unplaced[0] or board.my_unplaced[1] or board.my_player_turn == Player.Neutral:
+            return None
+        if self._table((board.my_placed[0], board.my_placed[1])) is None:
+            return None
+        white_mask, black_mask = board_masks(board)
+        return self.code(white_mask, black_mask, board.my_player_turn)
+
+    def probe(self, board: Board | BitBoard) -> Optional[EndgameEntry]:
+        """Value of `board` for the side to move, or None if no table covers it."""
+        code = self._board_code(board)
+        return None if code is None else decode_entry(code)
+
+    def score(self, board: Board | BitBoard, evals: EvalSettings) -> Optional[int]:
+        """Search score of `board` for the side to move: faster wins and slower losses score higher."""
+        code = self._board_code(board)
+        if code is None:
+            return None
+        if code == DRAW:
+            return 0
+        if code & 1:
+            return evals.BestScore - ((code - 1) >> 1)
+        return evals.WorstScore + ((code - 2) >> 1)
+
+    def best_move(self, board: Board | BitBoard) -> Optional[tuple[Move, EndgameEntry]]:
+        """A perfect move for the side to move and the value it keeps.
+
+        Wins are taken by the shortest route, losses resisted as long as
+        possible. None when the game is over or a needed table is missing or
+        has no distances.
+        """
+        code = self._board_code(board)
+        if code is None or code in (WIN_NOW, LOSS_NOW) or not self.has_distances(
+            (board.my_placed[0], board.my_placed[1])
+        ):
+            return None
+
+        turn = board.my_player_turn
+        other = Player.Black if turn == Player.White else Player.White
+        white_mask, black_mask = board_masks(board)
+        own, opp = (white_mask, black_mask) if turn == Player.White else (black_mask, white_mask)
+
+        best: Optional[tuple[int, Move]] = None
+        for move, own_after, opp_after in successors(own, opp):
+            if turn == Player.White:
+                reply = self.code(own_after, opp_after, other)
+            else:
+                reply = self.code(opp_after, own_after, other)
+            if reply is None or (reply >> 1) >= UNKNOWN_DISTANCE:
+                return None
+            # Rank by the value for us: shortest win, then draw, then longest loss.
+            if reply == DRAW:
+                rank = 0
+            elif reply & 1:
+                rank = -1000 + ((reply - 1) >> 1)
+            else:
+                rank = 1000 - ((reply - 2) >> 1)
+            if best is None or rank > best[0]:
+                best = (rank, move)
+
+        if best is None:
+            return None
+        return best[1], decode_entry(code)
@@ -1,7 +1,22 @@
 from .board_index import BoardIndex
+from .bound_type import BoundType
+from .endgame_result import EndgameResult
 from .game_state import GameState
 from .move_type import MoveType
+from .parallel_mode import ParallelMode
 from .player import Player
+from .research_policy import ResearchPolicy
+from .stop_reason import StopReason
 
-__all__ = ["BoardIndex", "GameState", "MoveType", "Player"]
+__all__ = [
+    "BoardIndex",
+    "BoundType",
+    "EndgameResult",
+    "GameState",
+    "MoveType",
+    "ParallelMode",
+    "Player",
+    "ResearchPolicy",
+    "StopReason",
+]
 
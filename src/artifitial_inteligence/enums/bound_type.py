@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from enum import IntEnum
+
+
+class BoundType(IntEnum):
+    Exact = 0
+    Lower = 1
+    Upper = 2
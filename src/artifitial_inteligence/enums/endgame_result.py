@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from enum import IntEnum
+
+
+class EndgameResult(IntEnum):
+    # Game-theoretic value of a position for the side to move.
+    Loss = 0
+    Draw = 1
+    Win = 2
@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from enum import IntEnum
+
+
+class ParallelMode(IntEnum):
+    # How `GameController(..., workers=n)` uses its extra processes.
+    RootSplit = 0  # root moves divided among the processes (see parallel_search)
+    LazySmp = 1  # every process searches the whole root, sharing one transposition table (see lazy_smp)
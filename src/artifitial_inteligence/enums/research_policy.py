@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+from enum import IntEnum
+
+
+class ResearchPolicy(IntEnum):
+    # What the root does when a search falls outside its aspiration window.
+    Full = 0  # re-search with the full (WorstScore, BestScore) window on the failing side
+    Widen = 1  # double the window on the failing side and try again
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from enum import IntEnum
+
+
+class StopReason(IntEnum):
+    # Why `GameController.best_move()` stopped deepening.
+    DepthReached = 0  # the last iteration to `depth` completed
+    SoftTimeLimit = 1  # not enough time left to start another iteration
+    HardTimeLimit = 2  # aborted mid-iteration by the clock
+    NodeLimit = 3  # aborted mid-iteration by `max_nodes`
+    NoMoves = 4  # the root has no moves (game over)
+    Stopped = 5  # aborted mid-iteration through `TimeManager.stop_flag`
+    EndgameTable = 6  # answered from the endgame database without searching
+    OpeningBook = 7  # answered from the opening book without searching
+    AllMovesLose = 8  # the root has moves but none scores above the window's lower edge (lost)
@@ -1,132 +1,873 @@
 ﻿from __future__ import annotations
 
-import time
-from typing import Callable, Optional
+import os
+from dataclasses import replace
+from typing import Any, Callable, Iterable, Iterator, Optional
 
+from .bit_board import BitBoard
 from .board import Board
-from .enums import Player
+from .endgame_db import EndgameDatabase
+from .enums import BoundType, ParallelMode, Player, ResearchPolicy, StopReason
 from .eval_settings import EvalSettings
 from .game_node import GameNode
-from .move import Move
+from .lazy_smp import LazySmpHelpers
+from .models.iteration_stats import IterationStats
+from .models.search_stats import SearchStats
+from .models.worker_stats import WorkerStats
+from .move import CAPTURE_BIT, NO_MOVE, Move, decode_move, encode_move, move_key
+from .opening_book import OpeningBook
+from .parallel_search import ParallelRootSearch
+from .shared_transposition_table import SharedTranspositionTable
+from .symmetry import INVERSE, canonical_key, transform_code
+from .time_manager import SearchAborted, TimeManager
+from .transposition_table import TranspositionTable
 
 
 EvaluationBoardDelegate = Callable[[EvalSettings], int]
+IterationCallback = Callable[[SearchStats], None]
 
 
 class GameController:
-    def __init__(self, time_limit_ms: int, depth: int):
+    # Longest line the search can reach (nominal depth plus extensions).
+    MAX_PLY = 64
+
+    # Killer slots kept per ply for quiet (Drop / Move) moves that caused a cutoff.
+    KILLER_SLOTS = 2
+
+    # Shallower iterations are searched serially even with `workers > 1`; they are
+    # too small to pay for the inter-process traffic, and they seed root ordering.
+    PARALLEL_MIN_DEPTH = 4
+
+    def __init__(
+        self,
+        time_limit_ms: int,
+        depth: int,
+        use_bitboard: bool = False,
+        tt_size_mb: float = 16,
+        use_pvs: bool = True,
+        aspiration_window: int = 0,
+        research_policy: ResearchPolicy = ResearchPolicy.Widen,
+        quiescence_depth: int = 0,
+        soft_time_limit_ms: Optional[int] = None,
+        node_poll_interval: int = 128,
+        max_nodes: int = 0,
+        fixed_depth: bool = False,
+        on_iteration: Optional[IterationCallback] = None,
+        workers: int = 0,
+        parallel_mode: ParallelMode = ParallelMode.RootSplit,
+        endgame_db: Optional[str | os.PathLike | EndgameDatabase] = None,
+        opening_book: Optional[str | os.PathLike | OpeningBook] = None,
+        use_symmetry: bool = False,
+    ):
+        # `my_time_limit` is the hard limit: the search is aborted once it passes.
+        # `my_soft_time_limit` only stops new iterations from starting (None = 70% of the hard limit).
         self.my_time_limit = int(time_limit_ms)
+        self.my_soft_time_limit: Optional[int] = None if soft_time_limit_ms is None else int(soft_time_limit_ms)
+        self.my_time_manager = TimeManager(node_poll_interval)
         self.depth = int(depth)
 
+        # Deterministic modes for benchmarking: a node budget (0 = none) and/or a strict
+        # fixed depth. Either one ignores the clock and starts every search from an empty
+        # transposition table and history, so the same position always gives the same
+        # move and node count.
+        self.max_nodes = int(max_nodes)
+        self.fixed_depth = bool(fixed_depth)
+
+        # Search on a `BitBoard` copy of `my_board` (same moves and scores, much cheaper copies).
+        self.use_bitboard = bool(use_bitboard)
+
+        # Extra search processes: with `workers > 1`, iterations from PARALLEL_MIN_DEPTH on
+        # either split the root moves among `workers` processes (RootSplit) or run
+        # `workers - 1` Lazy SMP helpers next to this process (LazySmp). Processes start on
+        # first use and `dispose()` stops them. Neither is used with `max_nodes`, whose
+        # budget is only exact in one process.
+        self.workers = int(workers)
+        self.parallel_mode = ParallelMode(parallel_mode)
+        self._parallel: Optional[ParallelRootSearch] = None
+        self._smp: Optional[LazySmpHelpers] = None
+        self._worker_stats: dict[int, WorkerStats] = {}
+
+        # Transposition table shared by all iterations and all `computer_move()` calls
+        # (and, in LazySmp mode, by all helper processes). A budget of 0 MB disables it.
+        self.tt_size_mb = float(tt_size_mb)
+        self.my_tt: Optional[TranspositionTable | SharedTranspositionTable] = None
+        if self._lazy_smp():
+            if tt_size_mb <= 0:
+                raise ValueError("ParallelMode.LazySmp needs a transposition table (tt_size_mb > 0)")
+            self.my_tt = SharedTranspositionTable(tt_size_mb)
+        elif tt_size_mb > 0:
+            self.my_tt = TranspositionTable(tt_size_mb)
+        self._tt_eval_settings: Optional[EvalSettings] = None
+        # Key the table by the canonical image of each position under the 16 board
+        # symmetries, so symmetric positions share one entry (moves are stored in the
+        # canonical frame). Costs a canonicalisation per node; a position with more
+        # than `Board.MAX_MOVES` moves may see a differently truncated move list.
+        self.use_symmetry = bool(use_symmetry)
+        self._tt_quiescence_depth = 0
+
+        # Endgame tables (a directory or an open `EndgameDatabase`): a covered root is
+        # answered from the tables without searching, covered inner nodes score exactly.
+        if endgame_db is not None and not isinstance(endgame_db, EndgameDatabase):
+            endgame_db = EndgameDatabase(endgame_db)
+        self.endgame_db: Optional[EndgameDatabase] = endgame_db
+
+        # Opening book (a file or an open `OpeningBook`): a root found in it is played
+        # from the book without searching.
+        if opening_book is not None and not isinstance(opening_book, OpeningBook):
+            opening_book = OpeningBook(opening_book)
+        self.opening_book: Optional[OpeningBook] = opening_book
+
+        # Principal variation search: full window on the first move, null window
+        # (re-searched on a fail high) on the rest.
+        self.use_pvs = bool(use_pvs)
+
+        # Aspiration windows: from the second iteration on, search the root with
+        # +/- `aspiration_window` around the previous score (0 disables), and handle
+        # a score outside it according to `research_policy`.
+        self.aspiration_window = int(aspiration_window)
+        self.research_policy = ResearchPolicy(research_policy)
+
+        # Extra plies of capture-only search below the nominal depth (0 disables).
+        self.quiescence_depth = int(quiescence_depth)
+
+        # Principal variation of the last completed iteration, and the score each
+        # root move got in it (keyed by move code); both seed move ordering for the
+        # next iteration. The search works on move codes (`encode_move()`): the PV
+        # table and `_pv_codes` hold codes, `my_pv` is the same line as `Move`s.
+        self.my_pv: list[Move] = []
+        self.my_root_scores: dict[int, int] = {}
+        self._pv_codes: list[int] = []
+        self._pv_table: list[list[int]] = [[NO_MOVE] * GameController.MAX_PLY for _ in range(GameController.MAX_PLY)]
+        self._pv_length: list[int] = [0] * GameController.MAX_PLY
+        self._follow_pv = False
+
+        # One move buffer per ply, filled by `generate_moves()` and reused by every node at that ply.
+        self._move_buffers: list[list[int]] = [[NO_MOVE] * Board.MAX_MOVES for _ in range(GameController.MAX_PLY)]
+
+        # Quiet-move ordering: killers (move codes) per ply and a from/to history table
+        # indexed by the point fields of the move code (from 31 stands for "drop").
+        # History survives between searches, halved.
+        self._killers: list[list[int]] = [
+            [NO_MOVE] * GameController.KILLER_SLOTS for _ in range(GameController.MAX_PLY)
+        ]
+        self._history: list[int] = [0] * (32 * 32)
+
+        # Per-search counters: nodes visited, static evaluations, beta cutoffs and
+        # cutoffs on the first move tried.
+        self.my_nodes = 0
+        self.my_leaf_evals = 0
+        self.my_cutoffs = 0
+        self.my_first_move_cutoffs = 0
+        self.my_endgame_hits = 0
+
+        # Statistics of the last `best_move()` call (also attached to the node it returns),
+        # and an optional hook called with them after every completed iteration.
+        self.my_stats = SearchStats()
+        self.on_iteration: Optional[IterationCallback] = on_iteration
+
         self.my_hit_time_cutoff = False
+        # Best root move of the iteration in progress, used if that iteration is aborted.
+        self._root_partial: Optional[GameNode] = None
 
         self.my_last_board: Optional[Board] = None
         self.my_board: Optional[Board] = None
 
         self.my_eval_settings = EvalSettings()
 
-        self._search_start: Optional[float] = None
-
     def dispose(self) -> None:
+        if self._parallel is not None:
+            self._parallel.shutdown()
+            self._parallel = None
+        if self._smp is not None:
+            self._smp.shutdown()
+            self._smp = None
+        if isinstance(self.my_tt, SharedTranspositionTable):
+            self.my_tt.close()
+            self.my_tt = None
         if self.my_board is not None:
             self.my_board.dispose()
         if self.my_last_board is not None:
             self.my_last_board.dispose()
 
+    def _lazy_smp(self) -> bool:
+        return self.workers > 1 and self.parallel_mode == ParallelMode.LazySmp
+
     def _time_exceeded(self) -> bool:
-        if self.my_time_limit <= 0:
-            return False
-        if self._search_start is None:
-            return False
-        elapsed_ms = (time.perf_counter() - self._search_start) * 1000.0
-        return elapsed_ms > self.my_time_limit
+        return self.my_time_manager.hard_exceeded()
 
     def best_move_recursive(
         self,
-        current_board: Board,
+        current_board: Board | BitBoard,
         depth: int,
         my_best: int,
         his_best: int,
         first_call: bool,
-    ) -> Optional[GameNode]:
+        ply: int = 0,
+    ) -> int:
+        """Score of `current_board` for the side to move, searched `depth` plies into the window.
+
+        Moves are handled as move codes throughout; the best line found is left
+        in `_pv_table[ply]` (its first entry is the best move when `_pv_length[ply] > ply`).
+        """
+        self.my_nodes += 1
+        self.my_time_manager.poll(self.my_nodes)
+        self._pv_length[ply] = ply
+
+        if self.endgame_db is not None and not first_call:
+            exact = self.endgame_db.score(current_board, self.my_eval_settings)
+            if exact is not None:
+                self.my_endgame_hits += 1
+                return exact
+
         if depth == 0:
+            if self.quiescence_depth > 0:
+                return self._quiescence(current_board, my_best, his_best, self.quiescence_depth, ply)
+            self.my_leaf_evals += 1
             # Note: this intentionally evaluates the *current* board.
             # The original C# code stores a bound delegate, but that makes
             # recursion evaluate the wrong board instance.
-            return GameNode(current_board.evaluate(self.my_eval_settings), None)
-
-        if self._time_exceeded():
-            self.my_hit_time_cutoff = True
-            return None
-
-        move_list = current_board.get_moves()
-        moves_evaluated = 0
+            return current_board.evaluate(self.my_eval_settings)
+
+        key, symmetry = self._tt_key(current_board)
+        tt_move = NO_MOVE
+        if self.my_tt is not None:
+            entry = self.my_tt.probe(key)
+            if entry is not None:
+                tt_move = self._tt_move(entry.move, symmetry)
+                # The root always searches, so it still produces a move.
+                if (not first_call) and entry.depth >= depth:
+                    if (
+                        entry.bound == BoundType.Exact
+                        or (entry.bound == BoundType.Lower and entry.score >= his_best)
+                        or (entry.bound == BoundType.Upper and entry.score <= my_best)
+                    ):
+                        return entry.score
+
+        root_order: Optional[dict[int, int]] = None
+        ordered: Iterable[int]
+        if first_call:
+            # The root orders its full list (each ply generates into its own
+            # preallocated buffer of move codes). Root ties go to the first move in
+            # generation order, so the chosen move does not depend on move ordering
+            # (and a parallel root search picks the same one).
+            moves = self._move_buffers[ply]
+            count = current_board.generate_moves(moves)
+            root_order = GameController._generation_order(moves, count)
+            self._order_moves(moves, count, ply, tt_move, first_call)
+            ordered = moves[:count]
+        else:
+            ordered = self._staged_moves(current_board, ply, tt_move)
+
+        moves_searched = 0
+        moves_tried = 0
         best_score = my_best
-        best_move: Optional[Move] = None
+        best_move = NO_MOVE
 
-        while moves_evaluated < Board.MAX_MOVES and move_list[moves_evaluated] is not None:
-            mv = move_list[moves_evaluated]
-            assert mv is not None
+        for moves_evaluated, mv in enumerate(ordered):
+            moves_tried += 1
 
-            eval_board = Board(current_board)
-            eval_board.move(mv)
+            # Play the move on the shared search board and take it back afterwards,
+            # instead of copying the whole board for every candidate.
+            undo = current_board.make_move_code(mv)
 
-            if first_call and (self.my_last_board is not None) and eval_board.is_same_board_state(self.my_last_board):
+            if first_call and (self.my_last_board is not None) and current_board.is_same_board_state(self.my_last_board):
                 # Avoid infinite loop positions.
                 pass
             else:
-                attempt = self.best_move_recursive(
-                    eval_board,
-                    depth - 1,
-                    0 - his_best,
-                    0 - best_score,
-                    False,
-                )
-
-                if attempt is not None and (0 - attempt.score) > best_score:
-                    best_score = 0 - attempt.score
-                    best_move = Move(
-                        mv.type,
-                        start_position=mv.start_position,
-                        end_position=mv.end_position,
-                        capture_position=mv.capture_position,
+                alpha = best_score
+                if root_order is not None and best_move != NO_MOVE and root_order[mv] < root_order[best_move]:
+                    # This move would win a tie, so search one below the best to score a tie exactly.
+                    alpha -= 1
+                if moves_searched == 0 or not self.use_pvs:
+                    score = 0 - self.best_move_recursive(
+                        current_board,
+                        depth - 1,
+                        0 - his_best,
+                        0 - alpha,
+                        False,
+                        ply + 1,
+                    )
+                else:
+                    # Null window: only asks whether this move beats `alpha`.
+                    score = 0 - self.best_move_recursive(
+                        current_board,
+                        depth - 1,
+                        0 - (alpha + 1),
+                        0 - alpha,
+                        False,
+                        ply + 1,
                     )
+                    if alpha < score < his_best:
+                        score = 0 - self.best_move_recursive(
+                            current_board,
+                            depth - 1,
+                            0 - his_best,
+                            0 - alpha,
+                            False,
+                            ply + 1,
+                        )
+                moves_searched += 1
+
+                # Only the first move of a PV node continues the previous PV.
+                self._follow_pv = False
+
+                if first_call:
+                    self.my_root_scores[mv] = score
+
+                if score > best_score or (
+                    root_order is not None
+                    and best_move != NO_MOVE
+                    and score == best_score
+                    and root_order[mv] < root_order[best_move]
+                ):
+                    best_score = score
+                    best_move = mv
+                    self._update_pv(ply, mv)
+                    if first_call:
+                        self._root_partial = GameNode(best_score, decode_move(best_move))
+
+                # Cut off on >= (not >): an equal score would leave the next sibling an
+                # empty window, where a fail-low cannot be told apart from an upper bound
+                # and would poison the transposition table.
+                if best_score >= his_best:
+                    current_board.unmake_move(undo)
+                    self.my_cutoffs += 1
+                    if moves_evaluated == 0:
+                        self.my_first_move_cutoffs += 1
+                    if not mv & CAPTURE_BIT:
+                        self._record_quiet_cutoff(mv, depth, ply)
+                    break
+
+            current_board.unmake_move(undo)
 
-                if best_score > his_best:
-                    eval_board.dispose()
+        # Positions without moves score as the window's lower edge, so they are not stored.
+        # (An aborted search never gets here: `SearchAborted` unwinds past every store.)
+        if self.my_tt is not None and moves_tried > 0:
+            if best_score <= my_best:
+                bound = BoundType.Upper
+            elif best_score >= his_best:
+                bound = BoundType.Lower
+            else:
+                bound = BoundType.Exact
+            self.my_tt.store(key, depth, best_score, bound, transform_code(best_move, symmetry))
+
+        return best_score
+
+    def _quiescence(self, current_board: Board | BitBoard, my_best: int, his_best: int, depth: int, ply: int) -> int:
+        """Capture-only search at the horizon, using `evaluate()` as the stand-pat score."""
+        self.my_leaf_evals += 1
+        stand_pat = current_board.evaluate(self.my_eval_settings)
+        if depth == 0 or stand_pat >= his_best or ply + 1 >= GameController.MAX_PLY:
+            return stand_pat
+
+        best_score = max(my_best, stand_pat)
+        moves = self._move_buffers[ply]
+        for i in range(current_board.generate_captures(moves)[0]):
+            mv = moves[i]
+            self.my_nodes += 1
+            self.my_time_manager.poll(self.my_nodes)
+            undo = current_board.make_move_code(mv)
+            score = 0 - self._quiescence(current_board, 0 - his_best, 0 - best_score, depth - 1, ply + 1)
+            current_board.unmake_move(undo)
+            if score > best_score:
+                best_score = score
+                if best_score >= his_best:
                     break
+        return best_score
+
+    def _tt_key(self, board: Board | BitBoard) -> tuple[int, int]:
+        """Transposition table key of `board` and the symmetry into the frame its moves are stored in."""
+        if self.use_symmetry:
+            return canonical_key(board)
+        return board.get_hash(), 0
+
+    @staticmethod
+    def _tt_move(move: int, symmetry: int) -> int:
+        return transform_code(move, INVERSE[symmetry])
+
+    def _staged_moves(self, board: Board | BitBoard, ply: int, tt_move: int) -> Iterator[int]:
+        """Move codes of `board` in search order, quiet moves generated only once the search gets to them.
+
+        Stages: the move that continues the previous PV (else the TT move), if
+        legal; captures in generation order; the killers of `ply`; the other
+        quiet moves by history score. The captures are generated first, as
+        their count tells whether the list reaches `Board.MAX_MOVES`; if it
+        does, the quiet moves are generated too and the PV, TT and killer
+        moves are only tried if they made the cut. Otherwise a cutoff leaves
+        the quiet moves ungenerated. The moves and their order are those of
+        the full `generate_moves()` list ordered by `_order_moves()`, except
+        that the history is read when the quiet stage starts.
+        """
+        moves = self._move_buffers[ply]
+        captures, total = board.generate_captures(moves)
+        # Quiet moves go to `moves[captures:quiets]` once generated.
+        quiets = captures
+        cut = total >= Board.MAX_MOVES
+        if cut:
+            # The list may have been cut at MAX_MOVES: generate the quiet moves now,
+            # so that a PV, TT or killer move is only tried if it made the cut.
+            quiets = board.generate_quiets(moves, captures, total)
+
+        def legal(code: int) -> bool:
+            return code in moves[:quiets] if cut else board.is_legal_code(code)
+
+        first = NO_MOVE
+        if self._follow_pv and ply < len(self._pv_codes):
+            first = self._pv_codes[ply]
+            if not legal(first):
+                first = NO_MOVE
+                self._follow_pv = False
+        if first == NO_MOVE and tt_move != NO_MOVE and legal(tt_move):
+            first = tt_move
+        if first != NO_MOVE:
+            yield first
+
+        for i in range(captures):
+            if moves[i] != first:
+                yield moves[i]
+        if captures == total:
+            return
+
+        tried = [first]
+        for killer in self._killers[ply]:
+            if killer != NO_MOVE and killer not in tried and legal(killer):
+                tried.append(killer)
+                yield killer
+
+        if not cut:
+            quiets = board.generate_quiets(moves, captures, total)
+        history = self._history
+        history_index = GameController._history_index
+        rest = [m for m in moves[captures:quiets] if m not in tried]
+        rest.sort(key=lambda m: -history[history_index(m)])
+        yield from rest
+
+    def _order_moves(self, moves: list[int], count: int, ply: int, tt_move: int, first_call: bool) -> None:
+        """Order the move codes `moves[:count]` in place for searching."""
+        if first_call and self.my_root_scores:
+            # Root: best-scoring moves of the previous iteration first (stable, so
+            # unscored moves keep their MoveType order behind them).
+            scores = self.my_root_scores
+            worst = self.my_eval_settings.WorstScore - 1
+            moves[:count] = sorted(moves[:count], key=lambda m: -scores.get(m, worst))
+        else:
+            # Captures stay ahead in generation order; quiet moves behind them go
+            # killers first, then by history score.
+            q = 0
+            while q < count and moves[q] & CAPTURE_BIT:
+                q += 1
+
+            if count - q > 1:
+                killer, second_killer = self._killers[ply]
+                history = self._history
+                history_index = GameController._history_index
+
+                def quiet_rank(m: int) -> int:
+                    if m == killer:
+                        return -(1 << 40)
+                    if m == second_killer:
+                        return -(1 << 39)
+                    return -history[history_index(m)]
+
+                moves[q:count] = sorted(moves[q:count], key=quiet_rank)
+
+        first = NO_MOVE
+        if self._follow_pv and ply < len(self._pv_codes):
+            first = self._pv_codes[ply]
+            if not GameController._move_to_front(moves, count, first):
+                first = NO_MOVE
+                self._follow_pv = False
+        if first == NO_MOVE and tt_move != NO_MOVE:
+            GameController._move_to_front(moves, count, tt_move)
+
+    @staticmethod
+    def _move_to_front(moves: list[int], count: int, code: int) -> bool:
+        """Move `code` to the front of `moves[:count]`, the rest keeping their order; False if absent."""
+        try:
+            i = moves.index(code, 0, count)
+        except ValueError:
+            return False
+        moves[1 : i + 1] = moves[:i]
+        moves[0] = code
+        return True
+
+    @staticmethod
+    def _generation_order(moves: list[int], count: int) -> dict[int, int]:
+        return {m: i for i, m in enumerate(moves[:count])}
+
+    @staticmethod
+    def _history_index(code: int) -> int:
+        # The start and end point fields of the move code (start 31 = drop).
+        return code >> 2 & 0x3FF
+
+    def _record_quiet_cutoff(self, mv: int, depth: int, ply: int) -> None:
+        killers = self._killers[ply]
+        if killers[0] != mv:
+            killers[1] = killers[0]
+            killers[0] = mv
+        self._history[GameController._history_index(mv)] += depth * depth
+
+    def first_move_cutoff_rate(self) -> float:
+        """Share of beta cutoffs produced by the first move searched in the last search."""
+        if self.my_cutoffs == 0:
+            return 0.0
+        return self.my_first_move_cutoffs / self.my_cutoffs
+
+    def _update_pv(self, ply: int, mv: int) -> None:
+        row = self._pv_table[ply]
+        child = self._pv_table[ply + 1]
+        row[ply] = mv
+        child_length = self._pv_length[ply + 1] if ply + 1 < GameController.MAX_PLY else ply + 1
+        for k in range(ply + 1, child_length):
+            row[k] = child[k]
+        self._pv_length[ply] = max(child_length, ply + 1)
+
+    def _take_pv(self) -> None:
+        """Keep the root line of `_pv_table` as the PV to follow, and publish it as `my_pv`."""
+        self._pv_codes = [m for m in self._pv_table[0][: self._pv_length[0]] if m != NO_MOVE]
+        self.my_pv = [decode_move(m) for m in self._pv_codes]
+
+    def _search_root(self, root: Board | BitBoard, depth: int, guess: Optional[int]) -> Optional[GameNode]:
+        worst = self.my_eval_settings.WorstScore
+        best = self.my_eval_settings.BestScore
+        if guess is None or self.aspiration_window <= 0:
+            return self._search_root_window(root, depth, worst, best)
+
+        delta = self.aspiration_window
+        alpha = max(worst, guess - delta)
+        beta = min(best, guess + delta)
+        while True:
+            self._follow_pv = True
+            result = self._search_root_window(root, depth, alpha, beta)
+            if result is None:
+                return result
+
+            if result.score <= alpha and alpha > worst:
+                delta *= 2
+                alpha = worst if self.research_policy == ResearchPolicy.Full else max(worst, guess - delta)
+            elif result.score >= beta and beta < best:
+                delta *= 2
+                beta = best if self.research_policy == ResearchPolicy.Full else min(best, guess + delta)
+            else:
+                return result
 
-            eval_board.dispose()
-            moves_evaluated += 1
+    def _begin_search(self, eval_settings: EvalSettings, prepare_tt: bool = True) -> bool:
+        """Per-search setup of the TT, counters and quiet-move tables; True in a deterministic mode.
+
+        Also run by worker processes at the start of each search (Lazy SMP helpers
+        pass `prepare_tt=False`: the shared table is managed by the main search).
+        """
+        self.my_eval_settings = eval_settings
+        deterministic = self.fixed_depth or self.max_nodes > 0
+
+        if self.my_tt is not None and prepare_tt:
+            if deterministic:
+                self.my_tt.clear()
+            if self._tt_eval_settings != eval_settings or self._tt_quiescence_depth != self.quiescence_depth:
+                # Stored scores are only valid for the weights and horizon they were computed with.
+                self.my_tt.clear()
+                self._tt_eval_settings = replace(eval_settings)
+                self._tt_quiescence_depth = self.quiescence_depth
+            self.my_tt.new_search()
+
+        self.my_nodes = 0
+        self.my_leaf_evals = 0
+        self.my_cutoffs = 0
+        self.my_first_move_cutoffs = 0
+        self.my_endgame_hits = 0
+        self._worker_stats = {}
+        for killers in self._killers:
+            killers[0] = killers[1] = NO_MOVE
+        self._history = [0] * len(self._history) if deterministic else [h >> 1 for h in self._history]
+        return deterministic
+
+    def _search_root_window(self, root: Board | BitBoard, depth: int, my_best: int, his_best: int) -> Optional[GameNode]:
+        if (
+            self.workers > 1
+            and self.parallel_mode == ParallelMode.RootSplit
+            and depth >= GameController.PARALLEL_MIN_DEPTH
+            and self.max_nodes <= 0
+        ):
+            return self._parallel_root(root, depth, my_best, his_best)
+        score = self.best_move_recursive(root, depth, my_best, his_best, True)
+        best = self._pv_table[0][0] if self._pv_length[0] > 0 else NO_MOVE
+        return GameNode(score, None if best == NO_MOVE else decode_move(best))
+
+    def _parallel_root(self, root: Board | BitBoard, depth: int, my_best: int, his_best: int) -> GameNode:
+        """Root node of `best_move_recursive()` with the moves searched by the process pool."""
+        self.my_nodes += 1
+        key, symmetry = self._tt_key(root)
+        tt_move = NO_MOVE
+        if self.my_tt is not None:
+            entry = self.my_tt.probe(key)
+            if entry is not None:
+                tt_move = self._tt_move(entry.move, symmetry)
+
+        generated = self._move_buffers[0]
+        count = root.generate_moves(generated)
+        root_order = GameController._generation_order(generated, count)
+        self._order_moves(generated, count, 0, tt_move, True)
+        moves: list[int] = []
+        children: list[Board | BitBoard] = []
+        for mv in generated[:count]:
+            undo = root.make_move_code(mv)
+            if not ((self.my_last_board is not None) and root.is_same_board_state(self.my_last_board)):
+                moves.append(mv)
+                children.append(BitBoard(root) if isinstance(root, BitBoard) else Board(root))
+            root.unmake_move(undo)
+
+        if self._parallel is None:
+            self._parallel = ParallelRootSearch(self.workers, self._worker_options())
+            self._parallel.new_search()
+        results = self._parallel.search(
+            children, depth, my_best, his_best, self.my_eval_settings, self.my_time_manager.remaining_ms()
+        )
 
-        return GameNode(best_score, best_move)
+        best_score = my_best
+        best_index = -1
+        best_pv: list[int] = []
+        aborted = False
+        for index, score, alpha, child_pv, worker in results:
+            self._merge_worker_stats(worker)
+            if score is None:
+                aborted = True
+                continue
+            self.my_root_scores[moves[index]] = score
+            # Only scores above the alpha a move was searched with are exact; ties go to
+            # generation order, as in the serial search.
+            if score > alpha and (
+                score > best_score
+                or (
+                    best_index >= 0
+                    and score == best_score
+                    and root_order[moves[index]] < root_order[moves[best_index]]
+                )
+            ):
+                best_score = score
+                best_index = index
+                best_pv = child_pv
+
+        best_move = moves[best_index] if best_index >= 0 else NO_MOVE
+        if best_move != NO_MOVE:
+            line = [best_move] + best_pv
+            self._pv_table[0][: len(line)] = line
+            self._pv_length[0] = len(line)
+        else:
+            self._pv_length[0] = 0
+
+        if aborted:
+            if best_move != NO_MOVE:
+                self._root_partial = GameNode(best_score, decode_move(best_move))
+            raise SearchAborted()
+
+        if self.my_tt is not None and moves:
+            if best_score <= my_best:
+                bound = BoundType.Upper
+            elif best_score >= his_best:
+                bound = BoundType.Lower
+            else:
+                bound = BoundType.Exact
+            self.my_tt.store(key, depth, best_score, bound, transform_code(best_move, symmetry))
+
+        return GameNode(best_score, None if best_move == NO_MOVE else decode_move(best_move))
+
+    def _merge_worker_stats(self, worker: WorkerStats) -> None:
+        self.my_nodes += worker.nodes
+        self.my_leaf_evals += worker.leaf_evals
+        self.my_cutoffs += worker.cutoffs
+        self.my_first_move_cutoffs += worker.first_move_cutoffs
+        self.my_endgame_hits += worker.endgame_hits
+        total = self._worker_stats.get(worker.worker_id)
+        if total is None:
+            self._worker_stats[worker.worker_id] = worker
+        else:
+            total.merge(worker)
+
+    def _worker_options(self) -> dict[str, Any]:
+        """Constructor options for the search controllers inside worker processes."""
+        return dict(
+            use_bitboard=self.use_bitboard,
+            tt_size_mb=self.tt_size_mb,
+            use_pvs=self.use_pvs,
+            aspiration_window=self.aspiration_window,
+            research_policy=self.research_policy,
+            quiescence_depth=self.quiescence_depth,
+            node_poll_interval=self.my_time_manager.poll_interval,
+            fixed_depth=self.fixed_depth,
+            endgame_db=None if self.endgame_db is None else self.endgame_db.directory,
+            use_symmetry=self.use_symmetry,
+        )
 
     def best_move(self, eval_settings: EvalSettings) -> Optional[GameNode]:
         if self.my_board is None:
             raise RuntimeError("No board set; call pass_board() first")
 
-        self.my_eval_settings = eval_settings
         self.my_hit_time_cutoff = False
+        deterministic = self._begin_search(eval_settings)
+        if self._parallel is not None:
+            self._parallel.new_search()
+
+        if deterministic:
+            self.my_time_manager.start(0, 0, self.max_nodes)
+        else:
+            self.my_time_manager.start(self.my_time_limit, self.my_soft_time_limit)
+
+        if self.endgame_db is not None:
+            answer = self.endgame_db.best_move(self.my_board)
+            if answer is not None:
+                # Perfect play from the tables; nothing to search.
+                score = self.endgame_db.score(self.my_board, eval_settings)
+                assert score is not None
+                self.my_pv = [answer[0]]
+                self._pv_codes = [encode_move(answer[0])]
+                self.my_root_scores = {}
+                self.my_stats = SearchStats(
+                    stop_reason=StopReason.EndgameTable, time_ms=self.my_time_manager.elapsed_ms()
+                )
+                return GameNode(score, answer[0], self.my_stats)
+
+        if self.opening_book is not None:
+            book = self._book_move(self.my_board)
+            if book is not None:
+                self.my_pv = [book[0]]
+                self._pv_codes = [encode_move(book[0])]
+                self.my_root_scores = {}
+                self.my_stats = SearchStats(
+                    stop_reason=StopReason.OpeningBook, time_ms=self.my_time_manager.elapsed_ms()
+                )
+                return GameNode(book[1], book[0], self.my_stats)
+
+        # A single private copy is searched in place via make_move()/unmake_move().
+        root: Board | BitBoard = BitBoard(self.my_board) if self.use_bitboard else Board(self.my_board)
+
+        self.my_pv = []
+        self._pv_codes = []
+        self.my_root_scores = {}
+
+        if self._lazy_smp() and self.max_nodes <= 0 and self.depth >= GameController.PARALLEL_MIN_DEPTH:
+            if self._smp is None:
+                assert isinstance(self.my_tt, SharedTranspositionTable)
+                self._smp = LazySmpHelpers(self.workers - 1, self._worker_options(), self.my_tt)
+            # Helpers get their own copy: `root` is searched in place from here on.
+            self._smp.start(
+                BitBoard(root) if isinstance(root, BitBoard) else Board(root),
+                self.depth,
+                eval_settings,
+                self.my_time_manager.remaining_ms(),
+            )
 
-        self._search_start = time.perf_counter()
+        stats = SearchStats()
+        self.my_stats = stats
+        tt_probes = tt_hits = 0
+        if self.my_tt is not None:
+            tt_probes, tt_hits = self.my_tt.probes, self.my_tt.hits
 
         best: Optional[GameNode] = None
-        for depth in range(2, self.depth + 1):
-            temp = self.best_move_recursive(
-                self.my_board,
-                depth,
-                eval_settings.WorstScore,
-                eval_settings.BestScore,
-                True,
-            )
+        try:
+            for depth in range(2, self.depth + 1):
+                if depth > 2 and self.my_time_manager.soft_exceeded():
+                    stats.stop_reason = StopReason.SoftTimeLimit
+                    break
 
-            if temp is not None and temp.move is not None:
-                best = temp
+                self._follow_pv = True
+                self._root_partial = None
+                nodes_before = self.my_nodes
+                started_ms = self.my_time_manager.elapsed_ms()
+                temp = self._search_root(root, depth, None if best is None else best.score)
+
+                if temp is not None and temp.move is not None:
+                    best = temp
+                    self._take_pv()
+                    elapsed_ms = self.my_time_manager.elapsed_ms()
+                    stats.iterations.append(
+                        IterationStats(
+                            depth=depth,
+                            score=temp.score,
+                            move=temp.move,
+                            nodes=self.my_nodes - nodes_before,
+                            time_ms=elapsed_ms - started_ms,
+                            elapsed_ms=elapsed_ms,
+                        )
+                    )
+                    stats.depth = depth
+                    if self.on_iteration is not None:
+                        self._fill_stats(stats, tt_probes, tt_hits)
+                        self.on_iteration(stats)
+                else:
+                    # The fail-hard root keeps no move when every move scores WorstScore,
+                    # so only a root without moves is game over.
+                    if root.generate_moves(self._move_buffers[0]) == 0:
+                        stats.stop_reason = StopReason.NoMoves
+                    else:
+                        stats.stop_reason = StopReason.AllMovesLose
+                    break
+        except SearchAborted:
+            self.my_hit_time_cutoff = True
+            stop_flag = self.my_time_manager.stop_flag
+            if 0 < self.max_nodes < self.my_nodes:
+                stats.stop_reason = StopReason.NodeLimit
+            elif stop_flag is not None and stop_flag.value and not self.my_time_manager.hard_exceeded():
+                stats.stop_reason = StopReason.Stopped
             else:
-                break
-
+                stats.stop_reason = StopReason.HardTimeLimit
+            # Root moves are searched best-first, so a move that completed in the
+            # aborted pass is at least as well founded as the previous pass's choice.
+            if self._root_partial is not None and self._root_partial.move is not None:
+                best = self._root_partial
+                self._take_pv()
+        finally:
+            if self._smp is not None:
+                for worker in self._smp.stop():
+                    self._merge_worker_stats(worker)
+
+        self._fill_stats(stats, tt_probes, tt_hits)
+        if best is not None:
+            best.stats = stats
+
+        root.dispose()
         return best
 
+    def _book_move(self, board: Board) -> Optional[tuple[Move, int]]:
+        """The book's move for `board` if it is legal there (a key collision could give any move)."""
+        assert self.opening_book is not None
+        entry = self.opening_book.probe(board)
+        if entry is None:
+            return None
+        key = move_key(entry[0])
+        for m in board.get_moves():
+            if m is not None and move_key(m) == key:
+                return m, entry[1]
+        return None
+
+    def _fill_stats(self, stats: SearchStats, tt_probes: int, tt_hits: int) -> None:
+        """Copy the running counters into `stats` (TT counters relative to the start of the search)."""
+        stats.nodes = self.my_nodes
+        stats.leaf_evals = self.my_leaf_evals
+        stats.cutoffs = self.my_cutoffs
+        stats.first_move_cutoffs = self.my_first_move_cutoffs
+        stats.endgame_hits = self.my_endgame_hits
+        if self.my_tt is not None:
+            stats.tt_probes = self.my_tt.probes - tt_probes
+            stats.tt_hits = self.my_tt.hits - tt_hits
+        stats.workers = list(self._worker_stats.values())
+        stats.tt_probes += sum(w.tt_probes for w in stats.workers)
+        stats.tt_hits += sum(w.tt_hits for w in stats.workers)
+        stats.time_ms = self.my_time_manager.elapsed_ms()
+
+    def ponder(self, board: Board, eval_settings: EvalSettings) -> Optional[GameNode]:
+        """Search `board` on the opponent's time, usually the position after their expected reply.
+
+        Same as `best_move()` on `board` but without the clock: it runs to `depth`
+        unless `my_time_manager.stop_flag` is set, and what it finds stays in the
+        transposition table and history for the next search. `my_board` is not changed.
+        """
+        saved = self.my_board, self.my_time_limit, self.my_soft_time_limit
+        self.my_board, self.my_time_limit, self.my_soft_time_limit = board, 0, None
+        try:
+            return self.best_move(eval_settings)
+        finally:
+            self.my_board, self.my_time_limit, self.my_soft_time_limit = saved
+
     def computer_move(
         self,
         eval_settings: EvalSettings,
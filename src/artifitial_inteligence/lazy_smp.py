@@ -0,0 +1,125 @@
+"""Lazy SMP: helper processes search the same root as the main search.
+
+Each helper runs its own iterative deepening over the whole root, the odd
+ones starting a ply ahead of the main search, and all of them read and write
+the main search's `SharedTranspositionTable`. Helpers contribute only through
+that table (extra cutoffs and better move ordering for the main search); the
+move returned is always the main search's. Helpers stop when it finishes.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Optional
+
+from .bit_board import BitBoard
+from .board import Board
+from .eval_settings import EvalSettings
+from .models.worker_stats import WorkerStats
+from .shared_transposition_table import SharedTranspositionTable
+
+# Helper-process state, set up once by `_init_helper()`.
+_searcher: Any = None
+
+
+def _init_helper(options: dict[str, Any], tt_name: str, tt_size_mb: float, stop_flag: Any) -> None:
+    global _searcher
+    from .game_controller import GameController
+
+    _searcher = GameController(time_limit_ms=0, depth=0, **dict(options, tt_size_mb=0))
+    _searcher.my_tt = SharedTranspositionTable.attach(tt_name, tt_size_mb)
+    _searcher.my_time_manager.stop_flag = stop_flag
+
+
+def _helper_search(
+    index: int,
+    root: Board | BitBoard,
+    max_depth: int,
+    eval_settings: EvalSettings,
+    deadline: Optional[float],
+) -> WorkerStats:
+    """Iterative deepening on `root` until `max_depth`, the deadline or a stop request."""
+    from .time_manager import SearchAborted
+
+    searcher = _searcher
+    # The shared table is cleared and aged by the main search only.
+    searcher._begin_search(eval_settings, prepare_tt=False)
+    searcher.my_pv = []
+    searcher._pv_codes = []
+    searcher.my_root_scores = {}
+    time_left_ms = 0 if deadline is None else max(1, int((deadline - time.time()) * 1000.0))
+    searcher.my_time_manager.start(time_left_ms, 0, 0)
+
+    tt_probes, tt_hits = searcher.my_tt.probes, searcher.my_tt.hits
+    started = time.perf_counter()
+    best = None
+    try:
+        for depth in range(2 + index % 2, max_depth + 1):
+            searcher._follow_pv = True
+            searcher._root_partial = None
+            node = searcher._search_root(root, depth, None if best is None else best.score)
+            if node is None or node.move is None:
+                break
+            best = node
+            searcher._take_pv()
+    except SearchAborted:
+        pass
+
+    return WorkerStats(
+        worker_id=os.getpid(),
+        tasks=1,
+        nodes=searcher.my_nodes,
+        leaf_evals=searcher.my_leaf_evals,
+        cutoffs=searcher.my_cutoffs,
+        first_move_cutoffs=searcher.my_first_move_cutoffs,
+        tt_probes=searcher.my_tt.probes - tt_probes,
+        tt_hits=searcher.my_tt.hits - tt_hits,
+        endgame_hits=searcher.my_endgame_hits,
+        busy_ms=(time.perf_counter() - started) * 1000.0,
+    )
+
+
+class LazySmpHelpers:
+    """Pool of helper processes attached to one `SharedTranspositionTable`."""
+
+    def __init__(self, helpers: int, options: dict[str, Any], table: SharedTranspositionTable):
+        self.helpers = int(helpers)
+        ctx = multiprocessing.get_context()
+        self._stop = ctx.RawValue("b", 0)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.helpers,
+            mp_context=ctx,
+            initializer=_init_helper,
+            initargs=(options, table.name, table.size_mb, self._stop),
+        )
+        self._running: list[Future] = []
+
+    def start(
+        self,
+        root: Board | BitBoard,
+        max_depth: int,
+        eval_settings: EvalSettings,
+        time_left_ms: Optional[float],
+    ) -> None:
+        """Start every helper on `root` (which must not change until `stop()`)."""
+        self._stop.value = 0
+        deadline = None if time_left_ms is None else time.time() + time_left_ms / 1000.0
+        self._running = [
+            self._pool.submit(_helper_search, index, root, max_depth, eval_settings, deadline)
+            for index in range(1, self.helpers + 1)
+        ]
+
+    def stop(self) -> list[WorkerStats]:
+        """Stop the helpers and return what each of them did."""
+        self._stop.value = 1
+        stats = [future.result() for future in self._running]
+        self._running = []
+        return stats
+
+    def shutdown(self) -> None:
+        if self._running:
+            self.stop()
+        self._pool.shutdown(wait=True, cancel_futures=True)
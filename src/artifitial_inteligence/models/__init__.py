@@ -1,13 +1,28 @@
+from .endgame_entry import EndgameEntry
 from .eval_settings import EvalSettings
 from .game_node import GameNode
-from .move import Move, sort_moves_with_null_tail
+from .iteration_stats import IterationStats
+from .move import CAPTURE_BIT, NO_MOVE, Move, decode_move, encode_move, move_key, sort_moves_with_null_tail
 from .position import Position
+from .search_stats import SearchStats
+from .tt_entry import TTEntry
+from .worker_stats import WorkerStats
 
 __all__ = [
+    "CAPTURE_BIT",
+    "NO_MOVE",
+    "EndgameEntry",
     "EvalSettings",
     "GameNode",
+    "IterationStats",
     "Move",
     "Position",
+    "SearchStats",
+    "TTEntry",
+    "WorkerStats",
+    "decode_move",
+    "encode_move",
+    "move_key",
     "sort_moves_with_null_tail",
 ]
 
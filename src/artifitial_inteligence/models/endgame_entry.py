@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from ..enums import EndgameResult
+
+
+@dataclass(frozen=True)
+class EndgameEntry:
+    # Endgame database value of a position, for the side to move.
+    result: EndgameResult
+    # Plies to the end of the game with perfect play (0 for a draw, None from a `wdl_only` table).
+    distance: Optional[int] = 0
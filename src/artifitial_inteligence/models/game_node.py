@@ -4,12 +4,15 @@ from dataclasses import dataclass
 from typing import Optional
 
 from .move import Move
+from .search_stats import SearchStats
 
 
 @dataclass
 class GameNode:
     score: int
     move: Optional[Move] = None
+    # Set on the node returned by `GameController.best_move()` only.
+    stats: Optional[SearchStats] = None
 
     def dispose(self) -> None:
         if self.move is not None:
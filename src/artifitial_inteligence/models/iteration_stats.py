@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+from .move import Move
+
+
+@dataclass
+class IterationStats:
+    # One completed iterative-deepening pass.
+    depth: int
+    score: int
+    move: Optional[Move]
+    nodes: int  # nodes of this pass only
+    time_ms: float  # duration of this pass
+    elapsed_ms: float  # time from the start of the search to the end of this pass
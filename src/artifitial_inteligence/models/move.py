@@ -64,3 +64,39 @@ def sort_moves_with_null_tail(moves: list[Optional[Move]], max_moves: int) -> li
         return non_null[:max_moves]
     return non_null + [None] * (max_moves - len(non_null))
 
+
+# `encode_move()` layout: type in bits 0-1, then start / end / capture point in
+# 5 bits each (bits 2-6, 7-11, 12-16), with 31 standing for "no point".
+# The boards generate and play these codes directly (`generate_moves()`,
+# `make_move_code()`), so the search never builds `Move` objects.
+_NO_POINT = 31
+
+# 0 is never a move code (a drop has start 31, the other types set a type bit),
+# so it stands for "no move" wherever codes are stored.
+NO_MOVE = 0
+
+# Type bit set in the codes of DropAndCapture and MoveAndCapture moves.
+CAPTURE_BIT = 2
+
+
+def encode_move(m: Move) -> int:
+    """Pack a move into 17 bits (for tables and files)."""
+
+    def point(p: Optional[BoardIndex]) -> int:
+        return _NO_POINT if p is None else int(p)
+
+    return int(m.type) | point(m.start_position) << 2 | point(m.end_position) << 7 | point(m.capture_position) << 12
+
+
+def decode_move(code: int) -> Move:
+    """Inverse of `encode_move()`."""
+
+    def point(bits: int) -> Optional[BoardIndex]:
+        return None if bits == _NO_POINT else BoardIndex(bits)
+
+    return Move(MoveType(code & 3), point((code >> 2) & 31), point((code >> 7) & 31), point((code >> 12) & 31))
+
+
+def move_key(m: Move) -> tuple[MoveType, Optional[BoardIndex], Optional[BoardIndex], Optional[BoardIndex]]:
+    # `Move` is an unhashable dataclass; this tuple identifies it in dicts and sets.
+    return (m.type, m.start_position, m.end_position, m.capture_position)
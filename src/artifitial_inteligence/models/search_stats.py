@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from ..enums import StopReason
+from .iteration_stats import IterationStats
+from .worker_stats import WorkerStats
+
+
+@dataclass
+class SearchStats:
+    """Counters for one `GameController.best_move()` call."""
+
+    nodes: int = 0
+    leaf_evals: int = 0
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    tt_probes: int = 0
+    tt_hits: int = 0
+    endgame_hits: int = 0  # inner nodes scored from the endgame database
+    time_ms: float = 0.0
+    depth: int = 0  # deepest completed iteration
+    stop_reason: StopReason = StopReason.DepthReached
+    iterations: list[IterationStats] = field(default_factory=list)
+    # Per-process totals when the root is split across workers (empty for a serial search).
+    workers: list[WorkerStats] = field(default_factory=list)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    @property
+    def nodes_per_sec(self) -> float:
+        return self.nodes * 1000.0 / self.time_ms if self.time_ms > 0 else 0.0
+
+    @property
+    def branching_factor(self) -> float:
+        """Effective branching factor: geometric mean growth of nodes per completed iteration."""
+        if len(self.iterations) < 2:
+            return 0.0
+        first, last = self.iterations[0], self.iterations[-1]
+        if first.nodes <= 0 or last.depth <= first.depth:
+            return 0.0
+        return (last.nodes / first.nodes) ** (1.0 / (last.depth - first.depth))
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..enums import BoundType
+from .move import NO_MOVE
+
+
+@dataclass(slots=True)
+class TTEntry:
+    key: int
+    depth: int
+    score: int
+    bound: BoundType
+    # Best move as a move code (`encode_move()`), NO_MOVE if none.
+    move: int = NO_MOVE
+    generation: int = 0
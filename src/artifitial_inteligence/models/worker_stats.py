@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class WorkerStats:
+    # Work done by one search process during a `GameController.best_move()` call.
+    worker_id: int  # process id
+    tasks: int = 0
+    nodes: int = 0
+    leaf_evals: int = 0
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    tt_probes: int = 0
+    tt_hits: int = 0
+    endgame_hits: int = 0
+    busy_ms: float = 0.0
+
+    def merge(self, other: "WorkerStats") -> None:
+        self.tasks += other.tasks
+        self.nodes += other.nodes
+        self.leaf_evals += other.leaf_evals
+        self.cutoffs += other.cutoffs
+        self.first_move_cutoffs += other.first_move_cutoffs
+        self.tt_probes += other.tt_probes
+        self.tt_hits += other.tt_hits
+        self.endgame_hits += other.endgame_hits
+        self.busy_ms += other.busy_ms
@@ -3,7 +3,7 @@
 The actual Move dataclass lives in `artifitial_inteligence.models.move`.
 """
 
-from .models.move import Move, sort_moves_with_null_tail
+from .models.move import CAPTURE_BIT, NO_MOVE, Move, decode_move, encode_move, move_key, sort_moves_with_null_tail
 
-__all__ = ["Move", "sort_moves_with_null_tail"]
+__all__ = ["CAPTURE_BIT", "NO_MOVE", "Move", "decode_move", "encode_move", "move_key", "sort_moves_with_null_tail"]
 
@@ -0,0 +1,103 @@
+"""Opening book: best moves for the placement stage, searched offline.
+
+`opening_book_builder` runs deep searches from the initial position and
+writes the results with `write_book()`; `OpeningBook` reads a book file and
+answers probes by position key (`Board.get_hash()`, whose Zobrist keys are
+stable across runs). A symmetric book is keyed by `symmetry.canonical_key()`
+instead, with its moves stored in the canonical frame, so one entry serves
+all 16 images of a position.
+
+File layout (little-endian): a 32-byte header (magic, entry count, search
+depth, plies covered, flags), the sorted 64-bit keys, then one 32-bit packed move
+(`encode_move()`) and one 32-bit score per key.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Mapping, Optional
+
+from .bit_board import BitBoard
+from .board import Board
+from .move import Move, decode_move, encode_move
+from .symmetry import INVERSE, canonical_key, transform_move
+
+_MAGIC = b"NMMBOOK1"
+_HEADER = struct.Struct("<8sQHHB11x")
+_FLAG_SYMMETRIC = 1
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def write_book(
+    path: str | os.PathLike,
+    entries: Mapping[int, tuple[Move, int]],
+    depth: int = 0,
+    plies: int = 0,
+    symmetric: bool = False,
+) -> None:
+    """Write `entries` (position key -> (best move, score)) to `path`; `symmetric` if keyed by canonical key."""
+    keys = sorted(entries)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(keys), depth, plies, _FLAG_SYMMETRIC if symmetric else 0))
+        f.write(_little_endian(array("Q", keys)).tobytes())
+        f.write(_little_endian(array("I", (encode_move(entries[k][0]) for k in keys))).tobytes())
+        f.write(_little_endian(array("i", (entries[k][1] for k in keys))).tobytes())
+
+
+class OpeningBook:
+    """A book file loaded into sorted arrays; `probe()` is a binary search."""
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{self.path}: not an opening book")
+        magic, count, self.depth, self.plies, flags = _HEADER.unpack_from(data, 0)
+        self.symmetric = bool(flags & _FLAG_SYMMETRIC)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path}: not an opening book")
+        if len(data) != _HEADER.size + 16 * count:
+            raise ValueError(f"{self.path}: truncated or wrong size")
+
+        offset = _HEADER.size
+        self._keys = array("Q")
+        self._keys.frombytes(data[offset : offset + 8 * count])
+        offset += 8 * count
+        self._moves = array("I")
+        self._moves.frombytes(data[offset : offset + 4 * count])
+        offset += 4 * count
+        self._scores = array("i")
+        self._scores.frombytes(data[offset : offset + 4 * count])
+        if sys.byteorder == "big":
+            for values in (self._keys, self._moves, self._scores):
+                values.byteswap()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: int) -> bool:
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def probe(self, board: Board | BitBoard) -> Optional[tuple[Move, int]]:
+        """Book move and its search score (for the side to move), or None if `board` is not in the book.
+
+        The move comes from the key alone; callers should check it is legal
+        before playing it.
+        """
+        key, symmetry = canonical_key(board) if self.symmetric else (board.get_hash(), 0)
+        i = bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            return None
+        return transform_move(decode_move(self._moves[i]), INVERSE[symmetry]), self._scores[i]
@@ -0,0 +1,83 @@
+"""Builds an `OpeningBook` by deep searches from the initial position.
+
+The book covers the first `plies` plies for both colours. For a side, the
+tree is walked breadth first from `Board(Player.White)`: where that side is
+to move only its book move is followed, where the opponent is to move every
+reply is. Each position where the side is to move is searched once (the
+same position reached by different move orders shares its key), so a game
+stays in the book for as long as the book side's opponent stays within
+`plies`. With `symmetric`, positions are keyed by their canonical image
+under the board symmetries, so each symmetry class is searched and stored
+once (the first ply has 4 classes instead of 24 points).
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from .board import Board
+from .enums import Player
+from .eval_settings import EvalSettings
+from .game_controller import GameController
+from .move import Move
+from .symmetry import INVERSE, canonical_key, transform_move
+
+ProgressCallback = Callable[[str], None]
+
+
+def build_book(
+    plies: int,
+    depth: int,
+    time_limit_ms: int = 0,
+    workers: int = 0,
+    eval_settings: Optional[EvalSettings] = None,
+    progress: Optional[ProgressCallback] = None,
+    symmetric: bool = False,
+) -> dict[int, tuple[Move, int]]:
+    """Search every book position of the first `plies` plies; position key -> (best move, score).
+
+    Each search runs iterative deepening to `depth` on a bitboard, stopped
+    early only by `time_limit_ms` (0 = no limit). The transposition table
+    is kept between positions, as neighbouring positions share most of
+    their subtrees. With `symmetric` the keys are canonical keys and the
+    moves are in the canonical frame (write with `write_book(..., symmetric=True)`).
+    """
+    settings = eval_settings or EvalSettings()
+    ai = GameController(time_limit_ms, depth, use_bitboard=True, workers=workers)
+    entries: dict[int, tuple[Move, int]] = {}
+
+    def book_key(board: Board) -> tuple[int, int]:
+        return canonical_key(board) if symmetric else (board.get_hash(), 0)
+
+    def say(text: str) -> None:
+        if progress is not None:
+            progress(text)
+
+    try:
+        for side in (Player.White, Player.Black):
+            frontier = [Board(Player.White)]
+            for ply in range(plies):
+                following: dict[int, Board] = {}
+                for board in frontier:
+                    if board.has_won(Player.White) or board.has_won(Player.Black):
+                        continue
+                    if board.my_player_turn == side:
+                        key, symmetry = book_key(board)
+                        if key not in entries:
+                            ai.my_board = Board(board)
+                            node = ai.best_move(settings)
+                            if node is None or node.move is None:
+                                continue
+                            entries[key] = (transform_move(node.move, symmetry), node.score)
+                        moves = [transform_move(entries[key][0], INVERSE[symmetry])]
+                    else:
+                        moves = [m for m in board.get_moves() if m is not None]
+                    for m in moves:
+                        child = Board(board)
+                        child.move(m)
+                        following.setdefault(book_key(child)[0], child)
+                say(f"{side.name}, ply {ply}: {len(frontier)} positions, {len(entries)} book entries")
+                frontier = list(following.values())
+    finally:
+        ai.dispose()
+    return entries
@@ -0,0 +1,191 @@
+"""Root splitting across a process pool.
+
+The first (best-ordered) root move is searched on its own to establish a bound
+("young brothers wait"); the remaining root moves are then searched in
+parallel. Workers share the best root score found so far through a
+`multiprocessing.Value` and start each move from it, so later moves are mostly
+refuted with a null window, as in the serial search.
+
+Each move is searched with alpha one below the shared score, so a move that
+*ties* the best is still scored exactly. Like the serial root, ties then go to
+the first move in generation order, so both pick the same move at a fixed depth.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Optional
+
+from .bit_board import BitBoard
+from .board import Board
+from .eval_settings import EvalSettings
+from .models.worker_stats import WorkerStats
+from .move import NO_MOVE
+
+# (root index, root score or None if aborted, alpha used, child PV as move codes, stats)
+RootMoveResult = tuple[int, Optional[int], int, list[int], WorkerStats]
+
+# Worker-process state, set up once by `_init_worker()`.
+_searcher: Any = None
+_shared_best: Any = None
+_search_id = -1
+
+
+def _init_worker(options: dict[str, Any], shared_best: Any) -> None:
+    global _searcher, _shared_best
+    from .game_controller import GameController
+
+    _searcher = GameController(time_limit_ms=0, depth=0, **options)
+    _shared_best = shared_best
+
+
+def _search_root_move(
+    index: int,
+    child: Board | BitBoard,
+    depth: int,
+    my_best: int,
+    his_best: int,
+    eval_settings: EvalSettings,
+    deadline: Optional[float],
+    search_id: int,
+) -> RootMoveResult:
+    """Search one root move (`child` is the position after it) in a worker process."""
+    from .time_manager import SearchAborted
+
+    global _search_id
+    searcher = _searcher
+    if search_id != _search_id:
+        # First task of a new `best_move()` call: same per-search setup as the parent.
+        searcher._begin_search(eval_settings)
+        _search_id = search_id
+    # Tasks can sit in the queue for a while, so the limit travels as a wall-clock deadline.
+    time_left_ms = 0 if deadline is None else max(1, int((deadline - time.time()) * 1000.0))
+    searcher.my_time_manager.start(time_left_ms, 0, 0)
+    searcher._follow_pv = False
+
+    before = (
+        searcher.my_nodes,
+        searcher.my_leaf_evals,
+        searcher.my_cutoffs,
+        searcher.my_first_move_cutoffs,
+        searcher.my_tt.probes if searcher.my_tt is not None else 0,
+        searcher.my_tt.hits if searcher.my_tt is not None else 0,
+        searcher.my_endgame_hits,
+    )
+    started = time.perf_counter()
+
+    # One below the shared best, so a tie is still scored exactly (see module docstring).
+    alpha = max(my_best, _shared_best.value - 1)
+    score: Optional[int] = None
+    pv: list[int] = []
+    try:
+        if alpha < his_best:
+            if alpha > my_best and searcher.use_pvs:
+                score = 0 - searcher.best_move_recursive(child, depth, 0 - (alpha + 1), 0 - alpha, False, 1)
+                if alpha < score < his_best:
+                    score = 0 - searcher.best_move_recursive(child, depth, 0 - his_best, 0 - alpha, False, 1)
+            else:
+                score = 0 - searcher.best_move_recursive(child, depth, 0 - his_best, 0 - alpha, False, 1)
+            pv = [m for m in searcher._pv_table[1][1 : searcher._pv_length[1]] if m != NO_MOVE]
+        else:
+            # A sibling already failed high; this move cannot matter.
+            score = alpha
+
+        if score > alpha:
+            with _shared_best.get_lock():
+                if score > _shared_best.value:
+                    _shared_best.value = score
+    except SearchAborted:
+        score = None
+
+    stats = WorkerStats(
+        worker_id=os.getpid(),
+        tasks=1,
+        nodes=searcher.my_nodes - before[0],
+        leaf_evals=searcher.my_leaf_evals - before[1],
+        cutoffs=searcher.my_cutoffs - before[2],
+        first_move_cutoffs=searcher.my_first_move_cutoffs - before[3],
+        tt_probes=(searcher.my_tt.probes if searcher.my_tt is not None else 0) - before[4],
+        tt_hits=(searcher.my_tt.hits if searcher.my_tt is not None else 0) - before[5],
+        endgame_hits=searcher.my_endgame_hits - before[6],
+        busy_ms=(time.perf_counter() - started) * 1000.0,
+    )
+    return index, score, alpha, pv, stats
+
+
+class ParallelRootSearch:
+    """Process pool that searches the root moves of one iteration in parallel."""
+
+    def __init__(self, workers: int, options: dict[str, Any]):
+        self.workers = int(workers)
+        ctx = multiprocessing.get_context()
+        self._shared_best = ctx.Value("i", 0)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(options, self._shared_best),
+        )
+        self._search_id = 0
+
+    def new_search(self) -> None:
+        self._search_id += 1
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def search(
+        self,
+        children: list[Board | BitBoard],
+        depth: int,
+        my_best: int,
+        his_best: int,
+        eval_settings: EvalSettings,
+        time_left_ms: Optional[float],
+    ) -> list[RootMoveResult]:
+        """Search the positions after each root move (in root order) to `depth - 1`.
+
+        Returns the results in completion order; pending moves are cancelled
+        once one fails high (score >= `his_best`).
+        """
+        if not children:
+            return []
+        deadline = None if time_left_ms is None else time.time() + time_left_ms / 1000.0
+
+        with self._shared_best.get_lock():
+            self._shared_best.value = my_best
+
+        def submit(index: int) -> Future:
+            return self._pool.submit(
+                _search_root_move,
+                index,
+                children[index],
+                depth - 1,
+                my_best,
+                his_best,
+                eval_settings,
+                deadline,
+                self._search_id,
+            )
+
+        # Young brothers wait: the eldest move sets the bound for the rest.
+        eldest = submit(0).result()
+        results = [eldest]
+        if eldest[1] is None or eldest[1] >= his_best:
+            return results
+
+        pending = {submit(i) for i in range(1, len(children))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                result = future.result()
+                results.append(result)
+                if result[1] is not None and result[1] >= his_best:
+                    for other in pending:
+                        other.cancel()
+        return results
@@ -0,0 +1,102 @@
+"""Move-generator tree walks ("perft") for speed measurement and validation.
+
+Like the search, these walk the raw `generate_moves()` tree of move codes and
+do not stop at won positions, so the counts measure the generator and
+make/unmake only. `perft_compare()` checks the public `get_moves()` lists.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .bit_board import BitBoard
+from .board import Board
+from .enums import MoveType
+from .move import NO_MOVE, Move, move_key
+
+
+def perft(board: Board | BitBoard, depth: int) -> int:
+    """Number of leaf nodes `depth` plies below `board`."""
+    if depth <= 0:
+        return 1
+
+    moves = [NO_MOVE] * Board.MAX_MOVES
+    count = board.generate_moves(moves)
+    if depth == 1:
+        return count
+
+    total = 0
+    for mv in moves[:count]:
+        undo = board.make_move_code(mv)
+        total += perft(board, depth - 1)
+        board.unmake_move(undo)
+    return total
+
+
+def perft_by_type(board: Board | BitBoard, depth: int) -> dict[MoveType, int]:
+    """Leaf nodes `depth` plies below `board`, split by the type of the move that reached them."""
+    counts = [0] * len(MoveType)
+    _perft_by_type(board, depth, counts)
+    return {t: counts[t] for t in MoveType}
+
+
+def _perft_by_type(board: Board | BitBoard, depth: int, counts: list[int]) -> None:
+    if depth <= 0:
+        return
+
+    moves = [NO_MOVE] * Board.MAX_MOVES
+    for mv in moves[: board.generate_moves(moves)]:
+        if depth == 1:
+            # The low two bits of a move code are its MoveType.
+            counts[mv & 3] += 1
+            continue
+        undo = board.make_move_code(mv)
+        _perft_by_type(board, depth - 1, counts)
+        board.unmake_move(undo)
+
+
+def perft_compare(a: Board | BitBoard, b: Board | BitBoard, depth: int) -> Optional[str]:
+    """Walk two boards in lockstep and compare their move lists at every node.
+
+    Returns None when both generators agree everywhere, otherwise a description
+    of the first difference (with the line of moves leading to it).
+    """
+    return _perft_compare(a, b, depth, [])
+
+
+def _perft_compare(a: Board | BitBoard, b: Board | BitBoard, depth: int, line: list[str]) -> Optional[str]:
+    moves_a = [m for m in a.get_moves() if m is not None]
+    moves_b = [m for m in b.get_moves() if m is not None]
+    keys_a = [move_key(m) for m in moves_a]
+    keys_b = [move_key(m) for m in moves_b]
+    if keys_a != keys_b:
+        only_a = [k for k in keys_a if k not in keys_b]
+        only_b = [k for k in keys_b if k not in keys_a]
+        return (
+            f"move lists differ after [{' '.join(line)}]: "
+            f"{type(a).__name__} only {only_a}, {type(b).__name__} only {only_b}"
+            + ("" if only_a or only_b else " (same moves, different order)")
+        )
+    if a.get_hash() != b.get_hash():
+        return f"position keys differ after [{' '.join(line)}]"
+    if depth <= 1:
+        return None
+
+    for mv in moves_a:
+        undo_a = a.make_move(mv)
+        undo_b = b.make_move(mv)
+        line.append(_describe(mv))
+        diff = _perft_compare(a, b, depth - 1, line)
+        line.pop()
+        a.unmake_move(undo_a)
+        b.unmake_move(undo_b)
+        if diff is not None:
+            return diff
+    return None
+
+
+def _describe(mv: Move) -> str:
+    text = "-".join(p.name for p in (mv.start_position, mv.end_position) if p is not None)
+    if mv.capture_position is not None:
+        text += f"x{mv.capture_position.name}"
+    return text
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import weakref
+from multiprocessing import shared_memory
+from typing import Optional
+
+from .enums import BoundType
+from .models.tt_entry import TTEntry
+from .move import NO_MOVE
+
+# Packed entry layout (one 64-bit word):
+#   bits  0-19  score + SCORE_OFFSET
+#   bits 20-27  depth
+#   bits 28-29  bound
+#   bits 30-37  generation (mod 256)
+#   bits 38-54  move (type 2 bits, start / end / capture 5 bits each, 31 = none)
+#   bit  55     move present
+#   bit  63     slot in use
+_SCORE_BITS = 20
+_SCORE_OFFSET = 1 << (_SCORE_BITS - 1)
+_DEPTH_SHIFT = 20
+_BOUND_SHIFT = 28
+_GEN_SHIFT = 30
+_MOVE_SHIFT = 38
+_HAS_MOVE = 1 << 55
+_VALID = 1 << 63
+_MASK64 = (1 << 64) - 1
+
+
+def _release(shm: shared_memory.SharedMemory, words: memoryview, owner: bool) -> None:
+    words.release()
+    shm.close()
+    if owner:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedTranspositionTable:
+    """`TranspositionTable` kept in `multiprocessing.shared_memory`, shared by search processes.
+
+    Same interface and replacement policy as `TranspositionTable`. Each slot is
+    two 64-bit words, the packed entry and `key ^ entry`, written without locks:
+    a slot torn by two processes writing at once fails the check on probe and
+    is treated as a miss. The generation lives in the block header, so every
+    process ages entries together; only the owner should call `clear()` or
+    `new_search()`.
+    """
+
+    SLOT_BYTES = 16
+    _HEADER_WORDS = 1
+
+    def __init__(self, size_mb: float, name: Optional[str] = None):
+        size = max(1, int(float(size_mb) * 1024 * 1024) // SharedTranspositionTable.SLOT_BYTES)
+        nbytes = (SharedTranspositionTable._HEADER_WORDS + 2 * size) * 8
+        self.owner = name is None
+        if self.owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            # Worker processes share the owner's resource tracker, so attaching does
+            # not add a second registration; only the owner unlinks the block.
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._words = self._shm.buf.cast("Q")
+        self._finalizer = weakref.finalize(self, _release, self._shm, self._words, self.owner)
+        self.size = size
+        self.name = self._shm.name
+        self.size_mb = float(size_mb)
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    @classmethod
+    def attach(cls, name: str, size_mb: float) -> "SharedTranspositionTable":
+        """Open a table created by another process (same `size_mb`)."""
+        return cls(size_mb, name)
+
+    def close(self) -> None:
+        """Release this process's mapping; the owner also removes the block."""
+        self._finalizer()
+
+    @property
+    def generation(self) -> int:
+        return self._words[0]
+
+    def clear(self) -> None:
+        self._shm.buf[:] = bytes(len(self._shm.buf))
+
+    def new_search(self) -> None:
+        self._words[0] = (self._words[0] + 1) & 0xFF
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        self.probes += 1
+        i = SharedTranspositionTable._HEADER_WORDS + 2 * (key % self.size)
+        words = self._words
+        data = words[i]
+        if not data & _VALID or words[i + 1] ^ data != key:
+            return None
+        self.hits += 1
+        return TTEntry(
+            key,
+            (data >> _DEPTH_SHIFT) & 0xFF,
+            (data & ((1 << _SCORE_BITS) - 1)) - _SCORE_OFFSET,
+            BoundType((data >> _BOUND_SHIFT) & 3),
+            (data >> _MOVE_SHIFT) & 0x1FFFF if data & _HAS_MOVE else NO_MOVE,
+            (data >> _GEN_SHIFT) & 0xFF,
+        )
+
+    def store(self, key: int, depth: int, score: int, bound: BoundType, move: int) -> None:
+        i = SharedTranspositionTable._HEADER_WORDS + 2 * (key % self.size)
+        words = self._words
+        generation = words[0]
+        old = words[i]
+        old_key = words[i + 1] ^ old
+
+        if old & _VALID and (old >> _GEN_SHIFT) & 0xFF == generation and depth < (old >> _DEPTH_SHIFT) & 0xFF:
+            return
+
+        if move != NO_MOVE:
+            move_bits = _HAS_MOVE | move << _MOVE_SHIFT
+        elif old & _VALID and old_key == key:
+            # Keep the best move from a previous pass of the same position.
+            move_bits = old & (_HAS_MOVE | (0x1FFFF << _MOVE_SHIFT))
+        else:
+            move_bits = 0
+
+        data = (
+            _VALID
+            | move_bits
+            | generation << _GEN_SHIFT
+            | int(bound) << _BOUND_SHIFT
+            | min(depth, 0xFF) << _DEPTH_SHIFT
+            | (score + _SCORE_OFFSET) & ((1 << _SCORE_BITS) - 1)
+        )
+        words[i] = data
+        words[i + 1] = (key ^ data) & _MASK64
+        self.stores += 1
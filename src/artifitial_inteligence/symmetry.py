@@ -0,0 +1,165 @@
+"""The 16 symmetries of the Nine Men's Morris board.
+
+The board is unchanged by the 8 rotations and reflections of the square and
+by swapping the outer and inner rings (the middle ring stays put), which
+together give 16 permutations of the 24 points that keep adjacency and mill
+lines. Positions related by a symmetry have the same value, so caches and
+tables can key them by one canonical representative: the image with the
+smallest (white mask, black mask) pair.
+
+Symmetry 0 is the identity. Masks are transformed through per-byte lookup
+tables, three lookups per mask.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .bit_board import BitBoard
+from .board import Board
+from .board_tables import ADJACENT_MASKS, MILL_MASKS, POINT_COUNT
+from .enums import BoardIndex
+from .move import NO_MOVE, Move
+from .zobrist import position_key
+
+
+def _coordinates(point: BoardIndex) -> tuple[int, int]:
+    # Offset from the centre point (D4): A..G and 1..7 map to -3..3.
+    return ord(point.name[0]) - ord("D"), int(point.name[1]) - 4
+
+
+def _build_symmetries() -> tuple[tuple[int, ...], ...]:
+    at = {_coordinates(p): int(p) for p in BoardIndex}
+    square = (
+        lambda x, y: (x, y),
+        lambda x, y: (-y, x),
+        lambda x, y: (-x, -y),
+        lambda x, y: (y, -x),
+        lambda x, y: (-x, y),
+        lambda x, y: (x, -y),
+        lambda x, y: (y, x),
+        lambda x, y: (-y, -x),
+    )
+
+    def swap_rings(x: int, y: int) -> tuple[int, int]:
+        ring = max(abs(x), abs(y))
+        return x // ring * (4 - ring), y // ring * (4 - ring)
+
+    found = []
+    for ring_swap in (False, True):
+        for f in square:
+            perm = []
+            for p in BoardIndex:
+                x, y = f(*_coordinates(p))
+                if ring_swap:
+                    x, y = swap_rings(x, y)
+                perm.append(at[(x, y)])
+            found.append(tuple(perm))
+    return tuple(found)
+
+
+# SYMMETRIES[s][p]: the point that point `p` is mapped to by symmetry `s`.
+SYMMETRIES: tuple[tuple[int, ...], ...] = _build_symmetries()
+SYMMETRY_COUNT = len(SYMMETRIES)
+
+# INVERSE[s]: the symmetry that undoes `s`.
+INVERSE: tuple[int, ...] = tuple(
+    next(t for t in range(SYMMETRY_COUNT) if all(SYMMETRIES[t][SYMMETRIES[s][p]] == p for p in range(POINT_COUNT)))
+    for s in range(SYMMETRY_COUNT)
+)
+
+
+def _mask_through(perm: tuple[int, ...], mask: int) -> int:
+    out = 0
+    for p in range(POINT_COUNT):
+        if mask >> p & 1:
+            out |= 1 << perm[p]
+    return out
+
+
+# _BYTE_TABLES[s][k][byte]: image under `s` of the points in byte `k` of a mask.
+_BYTE_TABLES: tuple[tuple[tuple[int, ...], ...], ...] = tuple(
+    tuple(tuple(_mask_through(perm, b << (8 * k)) for b in range(256)) for k in range(3)) for perm in SYMMETRIES
+)
+
+for _perm in SYMMETRIES:
+    assert all(_mask_through(_perm, ADJACENT_MASKS[p]) == ADJACENT_MASKS[_perm[p]] for p in range(POINT_COUNT))
+    assert sorted(_mask_through(_perm, m) for m in MILL_MASKS) == sorted(MILL_MASKS)
+del _perm
+
+
+def transform_mask(mask: int, symmetry: int) -> int:
+    """Image of a point mask under `symmetry`."""
+    low, mid, high = _BYTE_TABLES[symmetry]
+    return low[mask & 0xFF] | mid[mask >> 8 & 0xFF] | high[mask >> 16]
+
+
+def transform_move(move: Move, symmetry: int) -> Move:
+    """Image of a move under `symmetry` (the same move object for the identity)."""
+    if symmetry == 0:
+        return move
+    perm = SYMMETRIES[symmetry]
+
+    def point(p: Optional[BoardIndex]) -> Optional[BoardIndex]:
+        return None if p is None else BoardIndex(perm[p])
+
+    return Move(move.type, point(move.start_position), point(move.end_position), point(move.capture_position))
+
+
+# _CODE_POINTS[s][p]: SYMMETRIES[s][p] for the 5-bit point fields of a move code,
+# with the "no point" value 31 mapped to itself.
+_CODE_POINTS: tuple[tuple[int, ...], ...] = tuple(perm + (31,) * (32 - POINT_COUNT) for perm in SYMMETRIES)
+
+
+def transform_code(code: int, symmetry: int) -> int:
+    """`transform_move()` for a move code (`encode_move()`); NO_MOVE stays NO_MOVE."""
+    if symmetry == 0 or code == NO_MOVE:
+        return code
+    points = _CODE_POINTS[symmetry]
+    return code & 3 | points[code >> 2 & 31] << 2 | points[code >> 7 & 31] << 7 | points[code >> 12] << 12
+
+
+def canonical_masks(white_mask: int, black_mask: int) -> tuple[int, int, int]:
+    """(white, black, symmetry): the smallest image of the position and a symmetry that gives it."""
+    best_white, best_black, best = white_mask, black_mask, 0
+    for s in range(1, SYMMETRY_COUNT):
+        low, mid, high = _BYTE_TABLES[s]
+        w = low[white_mask & 0xFF] | mid[white_mask >> 8 & 0xFF] | high[white_mask >> 16]
+        if w > best_white:
+            continue
+        b = low[black_mask & 0xFF] | mid[black_mask >> 8 & 0xFF] | high[black_mask >> 16]
+        if w < best_white or b < best_black:
+            best_white, best_black, best = w, b, s
+    return best_white, best_black, best
+
+
+def canonical_white(white_mask: int) -> tuple[int, int]:
+    """(white, symmetry): the smallest image of the white mask alone, first symmetry giving it."""
+    best_white, best = white_mask, 0
+    for s in range(1, SYMMETRY_COUNT):
+        low, mid, high = _BYTE_TABLES[s]
+        w = low[white_mask & 0xFF] | mid[white_mask >> 8 & 0xFF] | high[white_mask >> 16]
+        if w < best_white:
+            best_white, best = w, s
+    return best_white, best
+
+
+def board_masks(board: Board | BitBoard) -> tuple[int, int]:
+    """(white mask, black mask) of a `Board` or `BitBoard`."""
+    if isinstance(board, BitBoard):
+        return board.my_masks[0], board.my_masks[1]
+    masks = [0, 0, 0]
+    for i, position in enumerate(board.my_positions):
+        masks[int(position.player)] |= 1 << i
+    return masks[0], masks[1]
+
+
+def canonical_key(board: Board | BitBoard) -> tuple[int, int]:
+    """(key, symmetry): Zobrist key of the canonical image of `board` and the symmetry mapping `board` onto it.
+
+    Equal for all 16 images of a position. A move found in the canonical
+    frame maps back to `board` with `transform_move(move, INVERSE[symmetry])`.
+    """
+    white_mask, black_mask = board_masks(board)
+    white_mask, black_mask, symmetry = canonical_masks(white_mask, black_mask)
+    return position_key(white_mask, black_mask, board.my_unplaced, board.my_player_turn), symmetry
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when the hard time limit or node budget runs out; caught by `GameController.best_move()`."""
+
+
+class TimeManager:
+    """Wall-clock (and optional node) budget for one search.
+
+    The hard limit aborts the search wherever it is (checked every
+    `poll_interval` nodes, leaves included); the soft limit only stops a new
+    iterative-deepening pass from starting. The node limit aborts on the exact
+    node, independent of machine speed. A limit of 0 or less means no limit.
+    """
+
+    def __init__(self, poll_interval: int = 128):
+        self.poll_interval = max(1, int(poll_interval))
+        self.hard_limit_ms = 0
+        self.soft_limit_ms = 0
+        self.max_nodes = 0
+        self._start: Optional[float] = None
+        # Optional shared flag (anything with a `.value`) another process sets to stop the search.
+        self.stop_flag: Optional[Any] = None
+
+    def start(self, hard_limit_ms: int, soft_limit_ms: Optional[int] = None, max_nodes: int = 0) -> None:
+        self.max_nodes = int(max_nodes)
+        self.hard_limit_ms = int(hard_limit_ms)
+        if soft_limit_ms is None:
+            # A pass started after ~70% of the budget rarely finishes even its first root move.
+            soft_limit_ms = (self.hard_limit_ms * 7) // 10
+        self.soft_limit_ms = min(int(soft_limit_ms), self.hard_limit_ms) if self.hard_limit_ms > 0 else 0
+        self._start = time.perf_counter()
+
+    def elapsed_ms(self) -> float:
+        if self._start is None:
+            return 0.0
+        return (time.perf_counter() - self._start) * 1000.0
+
+    def remaining_ms(self) -> Optional[float]:
+        """Time left before the hard limit (never below 1 ms), or None without a limit."""
+        if self.hard_limit_ms <= 0:
+            return None
+        return max(1.0, self.hard_limit_ms - self.elapsed_ms())
+
+    def hard_exceeded(self) -> bool:
+        return self.hard_limit_ms > 0 and self._start is not None and self.elapsed_ms() > self.hard_limit_ms
+
+    def soft_exceeded(self) -> bool:
+        return self.soft_limit_ms > 0 and self._start is not None and self.elapsed_ms() > self.soft_limit_ms
+
+    def poll(self, nodes: int) -> None:
+        """Call once per node; raises `SearchAborted` once the hard limit or node budget is gone or a stop is requested."""
+        if self.max_nodes > 0 and nodes > self.max_nodes:
+            raise SearchAborted()
+        if nodes % self.poll_interval == 0 and (
+            self.hard_exceeded() or (self.stop_flag is not None and self.stop_flag.value)
+        ):
+            raise SearchAborted()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from .enums import BoundType
+from .models.tt_entry import TTEntry
+from .move import NO_MOVE
+
+
+class TranspositionTable:
+    """Fixed-size, replace-by-depth hash table of search results keyed by Zobrist key.
+
+    One slot per `key % size`. A slot is overwritten when it is empty, holds an
+    entry from an earlier search (`new_search()` bumps the generation), or the
+    new result is at least as deep as the stored one. Entries are updated in
+    place, so a warm table does not allocate.
+    """
+
+    # Approximate CPython footprint of one slotted `TTEntry` plus its 64-bit key and list slot.
+    ENTRY_BYTES = 128
+
+    def __init__(self, size_mb: float):
+        self.size = max(1, int(float(size_mb) * 1024 * 1024) // TranspositionTable.ENTRY_BYTES)
+        self.entries: list[Optional[TTEntry]] = [None] * self.size
+        self.generation = 0
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def clear(self) -> None:
+        self.entries = [None] * self.size
+        self.generation = 0
+
+    def new_search(self) -> None:
+        self.generation += 1
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        self.probes += 1
+        entry = self.entries[key % self.size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: BoundType, move: int) -> None:
+        idx = key % self.size
+        entry = self.entries[idx]
+
+        if entry is None:
+            self.entries[idx] = TTEntry(key, depth, score, bound, move, self.generation)
+            self.stores += 1
+            return
+
+        if entry.generation == self.generation and depth < entry.depth:
+            return
+
+        if entry.key == key and move == NO_MOVE:
+            # Keep the best move from a previous pass of the same position.
+            move = entry.move
+
+        entry.key = key
+        entry.depth = depth
+        entry.score = score
+        entry.bound = bound
+        entry.move = move
+        entry.generation = self.generation
+        self.stores += 1
@@ -0,0 +1,48 @@
+"""Zobrist keys for Nine Men's Morris positions.
+
+A position key is the XOR of one key per occupied point, one key for the side
+to move and one key per player for the number of pieces still to be placed.
+The tables come from a fixed seed, so keys are stable across processes and
+runs (which lets them be stored on disk or shared between workers).
+"""
+
+from __future__ import annotations
+
+import random
+
+from .enums import Player
+
+_SEED = 0x4E4D4D  # "NMM"
+
+_rng = random.Random(_SEED)
+
+# PIECE_KEYS[player][point] for Player.White / Player.Black.
+PIECE_KEYS: tuple[tuple[int, ...], tuple[int, ...]] = (
+    tuple(_rng.getrandbits(64) for _ in range(24)),
+    tuple(_rng.getrandbits(64) for _ in range(24)),
+)
+
+# TURN_KEYS[player] for the side to move (Neutral included for fresh `Board(Player.Neutral)`).
+TURN_KEYS: tuple[int, int, int] = (_rng.getrandbits(64), _rng.getrandbits(64), _rng.getrandbits(64))
+
+# UNPLACED_KEYS[player][count] for 0..9 pieces left to place.
+UNPLACED_KEYS: tuple[tuple[int, ...], tuple[int, ...]] = (
+    tuple(_rng.getrandbits(64) for _ in range(10)),
+    tuple(_rng.getrandbits(64) for _ in range(10)),
+)
+
+del _rng
+
+
+def position_key(white_mask: int, black_mask: int, unplaced: list[int], turn: Player) -> int:
+    """Compute a key from scratch; boards keep theirs up to date incrementally."""
+    key = TURN_KEYS[int(turn)]
+    key ^= UNPLACED_KEYS[int(Player.White)][unplaced[int(Player.White)]]
+    key ^= UNPLACED_KEYS[int(Player.Black)][unplaced[int(Player.Black)]]
+    for player, mask in ((0, white_mask), (1, black_mask)):
+        keys = PIECE_KEYS[player]
+        while mask:
+            low = mask & -mask
+            key ^= keys[low.bit_length() - 1]
+            mask ^= low
+    return key
@@ -5,6 +5,7 @@ original engine package name (`artifitial_inteligence`) for C# parity.
 """
 
 from artifitial_inteligence import (  # noqa: F401
+    BitBoard,
     Board,
     BoardIndex,
     EvalSettings,
@@ -17,6 +18,7 @@ from artifitial_inteligence import (  # noqa: F401
 )
 
 __all__ = [
+    "BitBoard",
     "Board",
     "BoardIndex",
     "EvalSettings",
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from typing import Any, Optional
+
+from artifitial_inteligence import Board, EvalSettings, GameController, Move, Player
+
+# Computer plays Black (to move), as in `GameController.pass_board()`.
+_HUMAN_ID = 1
+_COMPUTER_ID = 2
+
+# name -> (cells in `BoardIndex` order as W / B / '.', black pieces lost, white pieces lost).
+# The lost counts are the extra arguments of `Board.fill_the_board()`; they are
+# what makes the unplaced counts reach zero in the moving and flying stages.
+POSITIONS: dict[str, tuple[str, int, int]] = {
+    "opening-early": (".W.BW.W.......B.........", 0, 0),
+    "opening-late": ("BWBW...W.B.B....W.WW..B.", 0, 0),
+    "midgame-open": ("B.WBBBWB.W.WB.B.B.WWW...", 1, 2),
+    "midgame-mills": ("B.WW..WBBB.WWBWW..WB..B.", 2, 1),
+    "midgame-crowded": (".BB.WW.BWBB.WB.B.WWB....", 1, 3),
+    "flying-defend": ("...W.B.B.W.WBB.BB.BB.B..", 0, 6),
+    "flying-attack": (".BBW....W.W.W..WB..WW...", 6, 2),
+}
+
+
+def load_position(name: str) -> Board:
+    cells, black_lost, white_lost = POSITIONS[name]
+    figures = [_HUMAN_ID if c == "W" else _COMPUTER_ID if c == "B" else 0 for c in cells]
+    board = Board(Player.Neutral)
+    board.fill_the_board(figures, _COMPUTER_ID, _HUMAN_ID, black_lost, white_lost)
+    return board
+
+
+def _move_json(mv: Optional[Move]) -> Optional[dict[str, Any]]:
+    if mv is None:
+        return None
+    return {
+        "type": mv.type.name,
+        "start": None if mv.start_position is None else mv.start_position.name,
+        "end": None if mv.end_position is None else mv.end_position.name,
+        "capture": None if mv.capture_position is None else mv.capture_position.name,
+    }
+
+
+def _controller(depth: int, args: argparse.Namespace) -> GameController:
+    # fixed_depth: no clock, fresh TT and history per call, so nodes and moves are reproducible.
+    return GameController(
+        time_limit_ms=0,
+        depth=depth,
+        use_bitboard=args.engine == "bitboard",
+        tt_size_mb=args.tt_size_mb,
+        quiescence_depth=args.quiescence_depth,
+        fixed_depth=True,
+    )
+
+
+def bench_position(name: str, args: argparse.Namespace) -> dict[str, Any]:
+    board = load_position(name)
+    settings = EvalSettings()
+
+    ai = _controller(args.depth, args)
+    ai.my_board = board
+    node = ai.best_move(settings)
+    stats = ai.my_stats
+
+    result: dict[str, Any] = {
+        "name": name,
+        "stage": board.get_stage().name,
+        "depth": stats.depth,
+        "move": _move_json(None if node is None else node.move),
+        "score": None if node is None else node.score,
+        "nodes": stats.nodes,
+        "leaf_evals": stats.leaf_evals,
+        "time_ms": round(stats.time_ms, 3),
+        "nodes_per_sec": int(stats.nodes_per_sec),
+        "first_move_cutoff_rate": round(stats.first_move_cutoff_rate, 4),
+        "tt_hit_rate": round(stats.tt_hit_rate, 4),
+        "branching_factor": round(stats.branching_factor, 3),
+        "stop_reason": stats.stop_reason.name,
+        # Time to each depth within the one iterative-deepening search.
+        "depths": [
+            {"depth": it.depth, "nodes": it.nodes, "time_ms": round(it.time_ms, 3), "elapsed_ms": round(it.elapsed_ms, 3)}
+            for it in stats.iterations
+        ],
+    }
+
+    if not args.no_memory:
+        # Separate run: tracemalloc slows allocation-heavy code too much to time under it.
+        tracemalloc.start()
+        ai = _controller(args.depth, args)
+        ai.my_board = board
+        ai.best_move(settings)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_memory_bytes"] = peak
+
+    return result
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the search benchmark suite and write the results as JSON."""
+    parser = argparse.ArgumentParser(prog="python -m pynmm.bench", description=main.__doc__)
+    parser.add_argument(
+        "positions",
+        nargs="*",
+        default=list(POSITIONS),
+        help=f"positions to run: {', '.join(POSITIONS)} (default: all)",
+    )
+    parser.add_argument("--depth", type=int, default=4, help="search depth (default: 4)")
+    parser.add_argument("--engine", choices=("board", "bitboard"), default="board")
+    parser.add_argument("--tt-size-mb", type=float, default=16)
+    parser.add_argument("--quiescence-depth", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak-memory run")
+    parser.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.depth < 2:
+        parser.error("--depth must be at least 2")
+    for name in args.positions:
+        if name not in POSITIONS:
+            parser.error(f"unknown position {name!r}")
+
+    results = []
+    for name in args.positions:
+        results.append(bench_position(name, args))
+        print(f"{name}: {results[-1]['nodes']} nodes, {results[-1]['time_ms']:.1f} ms", file=sys.stderr)
+
+    total_nodes = sum(r["nodes"] for r in results)
+    total_ms = sum(r["time_ms"] for r in results)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "engine": args.engine,
+        "depth": args.depth,
+        "tt_size_mb": args.tt_size_mb,
+        "quiescence_depth": args.quiescence_depth,
+        "positions": results,
+        "total": {
+            "nodes": total_nodes,
+            "time_ms": round(total_ms, 3),
+            "nodes_per_sec": int(total_nodes * 1000.0 / total_ms) if total_ms > 0 else 0,
+        },
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
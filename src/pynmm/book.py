@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Optional
+
+from artifitial_inteligence.opening_book import OpeningBook, write_book
+from artifitial_inteligence.opening_book_builder import build_book
+
+from .perft import parse_position
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Build or probe the placement-stage opening book."""
+    parser = argparse.ArgumentParser(prog="pynmm-book", description=main.__doc__)
+    parser.add_argument("-b", "--book", default="opening.book", help="book file (default: ./opening.book)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="search the first plies of the game and write the book")
+    p_build.add_argument("--plies", type=int, default=4, help="plies from the start covered (default: 4)")
+    p_build.add_argument("--depth", type=int, default=6, help="search depth per position (default: 6)")
+    p_build.add_argument("--time", type=int, default=0, help="time limit per position in ms (default: 0 = none)")
+    p_build.add_argument("--workers", type=int, default=0, help="search processes per position (default: serial)")
+    p_build.add_argument(
+        "--symmetric",
+        action="store_true",
+        help="key positions by their canonical image under the 16 board symmetries (one search per class)",
+    )
+
+    p_probe = sub.add_parser("probe", help="look up positions (start or CELLS:turn:wu:bu, see pynmm-perft)")
+    p_probe.add_argument("positions", nargs="+")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if args.plies < 1 or args.depth < 2:
+            parser.error("need --plies >= 1 and --depth >= 2")
+        start = time.perf_counter()
+
+        def progress(text: str) -> None:
+            print(f"[{time.perf_counter() - start:8.1f}s] {text}", file=sys.stderr)
+
+        entries = build_book(
+            args.plies, args.depth, args.time, args.workers, progress=progress, symmetric=args.symmetric
+        )
+        write_book(args.book, entries, args.depth, args.plies, symmetric=args.symmetric)
+        print(f"{args.book}: {len(entries)} positions")
+        return 0
+
+    book = OpeningBook(args.book)
+    for text in args.positions:
+        try:
+            board = parse_position(text)
+        except ValueError as e:
+            parser.error(str(e))
+        entry = book.probe(board)
+        if entry is None:
+            print(f"{text}: not in book")
+            continue
+        mv, score = entry
+        squares = "-".join(p.name for p in (mv.start_position, mv.end_position) if p is not None)
+        line = f"{text}: {mv.type.name} {squares}"
+        if mv.capture_position is not None:
+            line += f" x{mv.capture_position.name}"
+        print(f"{line} (score {score})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
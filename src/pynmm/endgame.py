@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Optional
+
+from artifitial_inteligence.endgame_builder import build, signatures_up_to
+from artifitial_inteligence.endgame_db import MAX_PIECES, MIN_PIECES, EndgameDatabase
+
+from .perft import parse_position
+
+
+def _parse_signature(text: str) -> tuple[int, int]:
+    white, sep, black = text.lower().partition("v")
+    if not sep or not white.isdigit() or not black.isdigit():
+        raise argparse.ArgumentTypeError(f"bad signature {text!r}; expected e.g. 4v3 (white v black)")
+    signature = (int(white), int(black))
+    if not all(MIN_PIECES <= n <= MAX_PIECES for n in signature):
+        raise argparse.ArgumentTypeError(f"piece counts must be {MIN_PIECES}..{MAX_PIECES}")
+    return signature
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Build or probe the moving/flying-stage endgame database."""
+    parser = argparse.ArgumentParser(prog="pynmm-egdb", description=main.__doc__)
+    parser.add_argument("-d", "--dir", default="egdb", help="table directory (default: ./egdb)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="solve signatures by retrograde analysis")
+    p_build.add_argument("signatures", nargs="*", type=_parse_signature, help="e.g. 3v3 4v3 (white v black)")
+    p_build.add_argument(
+        "--max-pieces",
+        type=int,
+        default=0,
+        help=f"also build every signature with {MIN_PIECES}..N pieces a side",
+    )
+    p_build.add_argument("--overwrite", action="store_true", help="rebuild tables that already exist")
+    p_build.add_argument(
+        "--wdl-only",
+        action="store_true",
+        help="store win/draw/loss without distances (2 bits per position; probe-only, cannot pick moves)",
+    )
+    p_build.add_argument(
+        "--symmetric",
+        action="store_true",
+        help="store one position per board symmetry class of the white pieces (about 1/13 of the size)",
+    )
+
+    p_probe = sub.add_parser("probe", help="look up positions (CELLS:turn:0:0, see pynmm-perft)")
+    p_probe.add_argument("positions", nargs="+")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        signatures = list(args.signatures)
+        if args.max_pieces:
+            signatures += signatures_up_to(args.max_pieces)
+        if not signatures:
+            parser.error("give signatures to build or --max-pieces")
+        start = time.perf_counter()
+
+        def progress(text: str) -> None:
+            print(f"[{time.perf_counter() - start:8.1f}s] {text}", file=sys.stderr)
+
+        for path in build(
+            args.dir,
+            signatures,
+            overwrite=args.overwrite,
+            progress=progress,
+            wdl_only=args.wdl_only,
+            symmetric=args.symmetric,
+        ):
+            print(path)
+        return 0
+
+    db = EndgameDatabase(args.dir)
+    for text in args.positions:
+        try:
+            board = parse_position(text)
+        except ValueError as e:
+            parser.error(str(e))
+        entry = db.probe(board)
+        if entry is None:
+            print(f"{text}: not covered")
+            continue
+        answer = db.best_move(board)
+        line = f"{text}: {entry.result.name}"
+        if entry.distance:
+            line += f" in {entry.distance} plies"
+        elif entry.distance is None:
+            line += " (no distance stored)"
+        if answer is not None:
+            mv = answer[0]
+            line += f", best {mv.type.name} {mv.start_position.name}-{mv.end_position.name}"
+            if mv.capture_position is not None:
+                line += f" x{mv.capture_position.name}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Optional
+
+from artifitial_inteligence import BitBoard, Board, BoardIndex, MoveType, Player
+from artifitial_inteligence.perft import perft_by_type, perft_compare
+
+# Positions in `CELLS:turn:white_unplaced:black_unplaced` notation, where CELLS
+# lists the 24 points in `BoardIndex` order as W / B / '.'.
+STANDARD_POSITIONS: dict[str, str] = {
+    "start": "........................:w:9:9",
+    "placement": ".W.......B.BW.B.W..BW...:w:5:5",
+    "moving": "BW.W..WBBB.WWBWW..WB..B.:w:0:0",
+    "flying": ".W.W....WBBB....B.B..B..:w:0:0",
+}
+
+_CELL_PLAYERS = {"W": Player.White, "B": Player.Black, ".": Player.Neutral}
+_TURN_PLAYERS = {"w": Player.White, "b": Player.Black}
+
+
+def parse_position(text: str) -> Board:
+    """Build a `Board` from a named standard position or `CELLS:turn:wu:bu` notation."""
+    text = STANDARD_POSITIONS.get(text, text)
+    parts = text.split(":")
+    if len(parts) != 4 or len(parts[0]) != 24 or parts[1] not in _TURN_PLAYERS:
+        raise ValueError(f"bad position {text!r}; expected CELLS:turn:white_unplaced:black_unplaced")
+
+    board = Board(_TURN_PLAYERS[parts[1]])
+    board.my_unplaced = [int(parts[2]), int(parts[3])]
+    for idx, ch in enumerate(parts[0].upper()):
+        if ch not in _CELL_PLAYERS:
+            raise ValueError(f"bad cell {ch!r} at {BoardIndex(idx).name}")
+        player = _CELL_PLAYERS[ch]
+        board.my_positions[idx].set_player(player)
+        if player != Player.Neutral:
+            board.my_placed[int(player)] += 1
+    for player in (Player.White, Player.Black):
+        placed, unplaced = board.my_placed[int(player)], board.my_unplaced[int(player)]
+        if not 0 <= unplaced <= 9 or placed + unplaced > 9:
+            raise ValueError(
+                f"bad {player.name} counts: {placed} placed + {unplaced} unplaced; "
+                "unplaced must be 0..9 and the total at most 9"
+            )
+    board.my_hash = board.compute_hash()
+    board.compute_tallies()
+    return board
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Count move-generator leaf nodes per depth and report nodes/sec."""
+    parser = argparse.ArgumentParser(prog="pynmm-perft", description=main.__doc__)
+    parser.add_argument(
+        "positions",
+        nargs="*",
+        default=list(STANDARD_POSITIONS),
+        help=f"standard position names ({', '.join(STANDARD_POSITIONS)}) or CELLS:turn:wu:bu (default: all standard)",
+    )
+    parser.add_argument("--depth", type=int, default=3, help="deepest ply to count (default: 3)")
+    parser.add_argument("--engine", choices=("board", "bitboard"), default="bitboard")
+    parser.add_argument(
+        "--cross-check",
+        action="store_true",
+        help="also walk Board and BitBoard in lockstep and fail on the first disagreement",
+    )
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name in args.positions:
+        try:
+            board = parse_position(name)
+        except ValueError as e:
+            parser.error(str(e))
+        target: Board | BitBoard = BitBoard(board) if args.engine == "bitboard" else board
+
+        print(f"{name} ({args.engine})")
+        for depth in range(1, args.depth + 1):
+            start = time.perf_counter()
+            counts = perft_by_type(target, depth)
+            elapsed = time.perf_counter() - start
+            total = sum(counts.values())
+            split = " ".join(f"{t.name}={counts[t]}" for t in MoveType)
+            nps = int(total / elapsed) if elapsed > 0 else 0
+            print(f"  depth {depth}: {total:>12} leaves  {elapsed:8.3f}s  {nps:>10} nodes/s  {split}")
+
+        if args.cross_check:
+            diff = perft_compare(Board(board), BitBoard(board), args.depth)
+            if diff is None:
+                print(f"  cross-check Board/BitBoard to depth {args.depth}: ok")
+            else:
+                print(f"  cross-check Board/BitBoard to depth {args.depth}: FAILED, {diff}")
+                failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
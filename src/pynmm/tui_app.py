@@ -10,8 +10,10 @@ from .tui_session import GameSession
 try:
     from textual import on
     from textual.app import App, ComposeResult
+    from textual.binding import Binding
     from textual.containers import Horizontal, Vertical, VerticalScroll
     from textual.widgets import Footer, Header, Input, Static
+    from textual.worker import WorkerCancelled, WorkerFailed
 except Exception as e:  # pragma: no cover
     raise ImportError(
         "Textual is required for this demo. Install with: python -m pip install textual"
@@ -22,6 +24,8 @@ class MorrisApp(App):
     TITLE = "Nine Men's Morris"
     SUB_TITLE = "Textual demo (AI or local multiplayer)"
 
+    BINDINGS = [Binding("escape", "stop_thinking", "Move now")]
+
     CSS = """
 Screen {
     layout: vertical;
@@ -67,6 +71,8 @@ Screen {
         super().__init__()
         self.session = GameSession()
         self.log_lines: list[str] = []
+        # The AI searches in a worker thread; this timer redraws its progress meanwhile.
+        self._thinking_timer = None
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -95,23 +101,62 @@ Screen {
 
     def _refresh(self) -> None:
         self.query_one("#board", Static).update(render_board(self.session.board))
-        self.query_one("#status", Static).update(
-            status_text(self.session.board, self.session.mode, self.session.ai_player)
-        )
+        status = status_text(self.session.board, self.session.mode, self.session.ai_player)
+        thinking = self.session.thinking_status()
+        if thinking:
+            status = f"{status}\n{thinking}"
+        self.query_one("#status", Static).update(status)
+
+    def _start_thinking(self) -> None:
+        self._thinking_timer = self.set_interval(0.2, self._refresh)
+        self.run_worker(self._think, thread=True, exclusive=True, group="ai")
+
+    def _think(self) -> None:
+        try:
+            out = self.session.think()
+        except Exception as e:
+            out = f"Error: {e}"
+        self.call_from_thread(self._thinking_done, out)
+
+    def _thinking_done(self, out: str) -> None:
+        if self._thinking_timer is not None:
+            self._thinking_timer.stop()
+            self._thinking_timer = None
+        self._log(out)
+        self._refresh()
+
+    def action_stop_thinking(self) -> None:
+        if self._thinking_timer is not None:
+            self.session.stop_thinking()
+
+    async def action_quit(self) -> None:
+        # Let a running search play its move and report it before exiting, then stop
+        # the ponder search (which that move may have started).
+        self.session.stop_thinking()
+        for worker in [w for w in self.workers if w.group == "ai"]:
+            try:
+                await worker.wait()
+            except (WorkerCancelled, WorkerFailed):
+                pass
+        self.session.stop_pondering()
+        self.exit()
 
     @on(Input.Submitted)
-    def _on_cmd(self, event: Input.Submitted) -> None:
+    async def _on_cmd(self, event: Input.Submitted) -> None:
         cmd = event.value.strip()
         self.query_one("#cmd", Input).value = ""
 
         if not cmd:
             return
+        if self._thinking_timer is not None:
+            self._log("AI is thinking; press Esc to make it move now.")
+            return
 
         self._log(f"> {cmd}")
         try:
-            out = self.session.apply_user_move(cmd)
+            out = self.session.apply_user_move(cmd, run_ai=False)
         except SystemExit:
-            self.exit()
+            await self.action_quit()
             return
         except Exception as e:
             out = f"Error: {e}"
@@ -119,4 +164,6 @@ Screen {
         if out:
             self._log(out)
         self._refresh()
+        if self.session.ai_to_move():
+            self._start_thinking()
 
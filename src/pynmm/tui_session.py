@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import ctypes
+import threading
+import time
 from dataclasses import dataclass, field
 from typing import Optional
 
-from artifitial_inteligence import Board, BoardIndex, EvalSettings, GameController, Move, MoveType, Player
+from artifitial_inteligence import Board, BoardIndex, EvalSettings, GameController, GameNode, Move, MoveType, Player
 
 from .tui_render import move_sig, parse_board_index
 
@@ -21,7 +24,24 @@ class GameSession:
     ai: Optional[GameController] = None
     game_over: bool = False
 
+    # True while `think()` runs (possibly in a worker thread); setting `_stop` makes it
+    # stop searching and play the best move found so far.
+    thinking: bool = False
+    _stop: ctypes.c_bool = field(default_factory=ctypes.c_bool, repr=False)
+
+    # Pondering: after each AI move, search the position after the reply the AI expects
+    # (or the current position, for all replies, without a prediction) in a background
+    # thread until the user moves. The search fills the AI's transposition table; if the
+    # user plays the expected move, its result is the AI's answer.
+    ponder: bool = False
+    _ponder_thread: Optional[threading.Thread] = field(default=None, repr=False)
+    _ponder_move: Optional[Move] = field(default=None, repr=False)
+    _ponder_result: Optional[GameNode] = field(default=None, repr=False)
+    _ponder_hit: bool = field(default=False, repr=False)
+    _ponder_started: float = field(default=0.0, repr=False)
+
     def reset(self) -> None:
+        self.stop_pondering()
         self.board = Board(Player.White)
         self.eval_settings = EvalSettings()
         self.ai = None
@@ -38,10 +58,139 @@ class GameSession:
             return "Black wins."
         return None
 
+    def ai_to_move(self) -> bool:
+        return (not self.game_over) and self.mode == "ai" and self.ai_player == self.board.my_player_turn
+
+    @staticmethod
+    def _describe(move: Move) -> str:
+        return f"{move.type.name} {move.start_position} {move.end_position} {move.capture_position}"
+
+    def think(self) -> str:
+        """Let the AI play its move. Safe to call from a worker thread; see `stop_thinking()`."""
+        if self.ai is None:
+            self.ai = GameController(self.time_limit_ms, self.depth)
+        self.thinking = True
+        try:
+            ai_move = self._ponder_answer() if self._ponder_hit else None
+            hit = ai_move is not None
+            if ai_move is None:
+                self.stop_pondering()
+                self._stop.value = False
+                self.ai.my_time_manager.stop_flag = self._stop
+                self.ai.my_board = self.board
+                ai_move = self.ai.computer_move(self.eval_settings, self.board.evaluate)
+        finally:
+            self.thinking = False
+
+        if ai_move is None:
+            return self._check_game_over() or "AI has no move."
+        msg = self._check_game_over() or f"AI played: {self._describe(ai_move)}" + (" (ponder hit)" if hit else "")
+        self.start_pondering()
+        return msg
+
+    @property
+    def pondering(self) -> bool:
+        return self._ponder_thread is not None
+
+    def start_pondering(self) -> None:
+        """Start searching on the user's time (if `ponder` is on and the user is to move)."""
+        if not self.ponder or self.pondering or self.ai is None or self.game_over or self.mode != "ai":
+            return
+        if self.ai_to_move():
+            return
+
+        # The AI's principal variation starts with its own move; the next one is the expected reply.
+        expected = self.ai.my_pv[1] if len(self.ai.my_pv) > 1 else None
+        if expected is not None:
+            expected = next((m for m in self._legal_moves() if move_sig(m) == move_sig(expected)), None)
+        board = Board(self.board)
+        if expected is not None:
+            board.move(expected)
+            if board.has_won(Player.White) or board.has_won(Player.Black):
+                return
+
+        self._ponder_move = expected
+        self._ponder_result = None
+        self._ponder_hit = False
+        self._stop.value = False
+        self.ai.my_time_manager.stop_flag = self._stop
+        ai = self.ai
+
+        def run() -> None:
+            self._ponder_result = ai.ponder(board, self.eval_settings)
+
+        self._ponder_thread = threading.Thread(target=run, name="pynmm-ponder", daemon=True)
+        self._ponder_started = time.perf_counter()
+        self._ponder_thread.start()
+
+    def stop_pondering(self) -> None:
+        """Abort a running ponder search and wait for it."""
+        thread = self._ponder_thread
+        if thread is None:
+            return
+        self._stop.value = True
+        thread.join()
+        self._ponder_thread = None
+        self._ponder_move = None
+        self._ponder_result = None
+        self._ponder_hit = False
+
+    def _ponder_user_move(self, move: Move) -> None:
+        # Called once the user's move is on the board: keep the search on a hit, drop it otherwise.
+        if not self.pondering:
+            return
+        if self._ponder_move is not None and move_sig(move) == move_sig(self._ponder_move) and not self.game_over:
+            self._ponder_hit = True
+        else:
+            self.stop_pondering()
+
+    def _ponder_answer(self) -> Optional[Move]:
+        """On a ponder hit: let the running search use what is left of the time limit and play its move.
+
+        The time spent pondering counts towards the move, so a search that has already
+        used the whole limit is stopped at once.
+        """
+        thread = self._ponder_thread
+        assert thread is not None
+        if self.time_limit_ms > 0:
+            elapsed = time.perf_counter() - self._ponder_started
+            thread.join(max(0.0, self.time_limit_ms / 1000.0 - elapsed))
+        else:
+            thread.join()
+        self._stop.value = True
+        thread.join()
+        node = self._ponder_result
+        self._ponder_thread = None
+        self._ponder_move = None
+        self._ponder_result = None
+        self._ponder_hit = False
+        if node is None or node.move is None:
+            return None
+        self.board.move(node.move)
+        return node.move
+
+    def stop_thinking(self) -> None:
+        """Make a running `think()` play the best move it has found so far."""
+        self._stop.value = True
+
+    def thinking_status(self) -> str:
+        ai = self.ai
+        if ai is not None and self.pondering and not self.thinking:
+            if self._ponder_move is None:
+                return "AI pondering all replies"
+            return f"AI pondering, expects: {self._describe(self._ponder_move)}"
+        if not self.thinking or ai is None:
+            return ""
+        return (
+            f"AI thinking: depth {ai.my_stats.depth} done, {ai.my_nodes} nodes, "
+            f"{ai.my_time_manager.elapsed_ms() / 1000.0:.1f}s (Esc: move now)"
+        )
+
     def _legal_moves(self) -> list[Move]:
         return [m for m in self.board.get_moves() if m is not None]
 
-    def apply_user_move(self, cmd: str) -> str:
+    def apply_user_move(self, cmd: str, run_ai: bool = True) -> str:
+        """Run one command; with `run_ai=False` an AI reply is left to the caller (see `think()`)."""
         if self.game_over:
             return "Game over. Type `new ai` or `new pvp` to start again."
 
@@ -52,6 +201,7 @@ class GameSession:
         op = parts[0].lower()
 
         if op in {"q", "quit", "exit"}:
+            self.stop_pondering()
             raise SystemExit(0)
 
         if op in {"h", "help", "?"}:
@@ -60,6 +210,7 @@ class GameSession:
                 "  new ai|pvp              start a new game\n"
                 "  set depth <n>           set AI search depth (ai mode)\n"
                 "  set time <ms>           set AI time limit in ms (ai mode)\n"
+                "  set ponder on|off       let the AI think on your time (ai mode)\n"
                 "  moves                   list legal moves (compact)\n"
                 "  drop <POS> [cap <POS>]  place a piece\n"
                 "  move <A> <B> [cap <C>]  move a piece\n"
@@ -81,20 +232,27 @@ class GameSession:
 
         if op == "set":
             if len(parts) != 3:
-                return "Usage: set depth <n> | set time <ms>"
+                return "Usage: set depth <n> | set time <ms> | set ponder on|off"
             key = parts[1].lower()
             val = parts[2]
+            self.stop_pondering()
             if key == "depth":
                 self.depth = max(1, int(val))
                 if self.ai is not None:
                     self.ai.depth = self.depth
+                self.start_pondering()
                 return f"depth={self.depth}"
             if key == "time":
                 self.time_limit_ms = max(0, int(val))
                 if self.ai is not None:
                     self.ai.my_time_limit = self.time_limit_ms
+                self.start_pondering()
                 return f"time_limit_ms={self.time_limit_ms}"
-            return "Usage: set depth <n> | set time <ms>"
+            if key == "ponder" and val.lower() in {"on", "off"}:
+                self.ponder = val.lower() == "on"
+                self.start_pondering()
+                return f"ponder={'on' if self.ponder else 'off'}"
+            return "Usage: set depth <n> | set time <ms> | set ponder on|off"
 
         if op == "moves":
             moves = self._legal_moves()
@@ -198,19 +356,10 @@ class GameSession:
         self.board.move(move_obj)
 
         msg = self._check_game_over() or "OK."
+        self._ponder_user_move(move_obj)
 
-        if (not self.game_over) and self.mode == "ai" and self.ai_player == self.board.my_player_turn:
-            if self.ai is None:
-                self.ai = GameController(self.time_limit_ms, self.depth)
-            self.ai.my_board = self.board
-            ai_move = self.ai.computer_move(self.eval_settings, self.board.evaluate)
-            if ai_move is None:
-                msg = (self._check_game_over() or "AI has no move.")
-            else:
-                msg = (
-                    self._check_game_over()
-                    or f"AI played: {ai_move.type.name} {ai_move.start_position} {ai_move.end_position} {ai_move.capture_position}"
-                )
+        if run_ai and self.ai_to_move():
+            msg = self.think()
 
         return msg
 